@@ -1,29 +1,146 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext, filedialog
-import threading
+import tkinter.font
+from tkinter import ttk
+import queue
+import io
+import os
 import sys
+import threading
+import collections
+import functools
+import math
+import re
+from types import MappingProxyType
+
+MAX_LOG_LINES = 5000
+SCAN_CHUNK = 4 << 20
+
+# Static layout of the "Advanced Tools" tab: (group label, ((button text, handler name), ...))
+_TOOLS_LAYOUT = (
+    ("File Operations", (("Load Binary File", "load_binary"),
+                         ("Export Data", "export_data"))),
+    ("System Control", (("Deep Analysis", "deep_analysis"),
+                        ("Memory Scan", "memory_scan"))),
+)
+
+# Read-only feature table shared by every core in the process
+_FEATURES = MappingProxyType({
+    "binary_analysis": "Advanced binary data processing",
+    "memory_management": "Enhanced memory handling",
+    "real_time_monitor": "Live system monitoring",
+    "data_recovery": "Advanced data reconstruction",
+    "pattern_analysis": "Binary pattern recognition"
+})
+_LOAD_MSG = f"FCUEX v0.1 loaded with {len(_FEATURES)} enhanced features"
+
+_BIN_FILETYPES = (("Binary files", "*.bin"), ("All files", "*.*"))
+_DAT_FILETYPES = (("Data files", "*.dat"), ("Text files", "*.txt"), ("All files", "*.*"))
+
+_O_BINARY = getattr(os, 'O_BINARY', 0)
+
+def _raw_read(path, chunk=1 << 20):
+    """Yield the file in chunks straight from the fd, bypassing io's buffering layer"""
+    fd = os.open(path, os.O_RDONLY | _O_BINARY)
+    try:
+        while True:
+            data = os.read(fd, chunk)
+            if not data:
+                break
+            yield data
+    finally:
+        os.close(fd)
+
+def _raw_write(path, data):
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o666)
+    try:
+        mv = memoryview(data)
+        while mv:
+            mv = mv[os.write(fd, mv):]
+    finally:
+        os.close(fd)
+
+def find_patterns(data, patterns):
+    """Return {pattern: [offsets]} for every hit of every pattern, overlaps included"""
+    hits = {}
+    for p in patterns:
+        # Zero-width lookahead: each match consumes nothing, so hits may overlap
+        hits[p] = [m.start() for m in re.finditer(b'(?=' + re.escape(p) + b')', data)]
+    return hits
 
 class FCUEX_Core:
     def __init__(self):
         self.version = "0.1"
         self.modules = {}
+        # Command verb -> handler(rest_of_line) -> result string
+        self._dispatch = {sys.intern("help"): self._cmd_help}
+        # Verbs with side effects; these bypass the result cache
+        self._volatile = set()
+        self._exec_cache = functools.lru_cache(maxsize=512)(self._execute_uncached)
         
     def add_module(self, name, functionality):
+        name = sys.intern(name)
         self.modules[name] = functionality
+        if callable(functionality):
+            self._dispatch[name] = functionality
+        self.invalidate()
+        
+    def add_modules(self, features):
+        # One bulk update instead of per-item inserts; interned keys keep
+        # later dispatch lookups on the identity-compare fast path
+        features = {sys.intern(k): v for k, v in features.items()}
+        self.modules.update(features)
+        self._dispatch.update((k, v) for k, v in features.items() if callable(v))
+        self.invalidate()
+        
+    def add_command(self, verb, handler, volatile=False):
+        verb = sys.intern(verb)
+        self._dispatch[verb] = handler
+        if volatile:
+            self._volatile.add(verb)
+        self.invalidate()
+        
+    def invalidate(self):
+        self._exec_cache.cache_clear()
         
     def execute_command(self, cmd):
-        return f"Executed: {cmd}"
+        if cmd.partition(' ')[0] in self._volatile:
+            return self._execute_uncached(cmd)
+        return self._exec_cache(cmd)
+        
+    def _execute_uncached(self, cmd):
+        verb, _, rest = cmd.partition(' ')
+        handler = self._dispatch.get(sys.intern(verb))
+        return handler(rest) if handler else f"Unknown: {verb}"
+        
+    def _cmd_help(self, rest):
+        lines = [f"{name}: {desc}" for name, desc in self.modules.items()]
+        return "\n".join(["Commands: " + ", ".join(sorted(self._dispatch))] + lines)
 
 class FCUEX_GUI:
     def __init__(self, root):
         self.root = root
         self.core = FCUEX_Core()
+        self.binary_data = b''
+        self.binary_path = None
+        self._scan_buf = bytearray(SCAN_CHUNK)
+        self._log_queue = collections.deque()
+        self._log_scheduled = False
+        # All slow work runs on one persistent worker; results come back
+        # through _result_q and are only applied on the Tk thread, woken by
+        # a <<WorkerResult>> virtual event instead of a polling timer
+        self._work_q = queue.Queue()
+        self._result_q = queue.Queue()
+        threading.Thread(target=self._worker_loop, daemon=True).start()
         self.setup_gui()
+        self.root.bind('<<WorkerResult>>', self._poll_results)
+        self.core.add_command("find", self._cmd_find, volatile=True)
         self.load_features()
         
     def setup_gui(self):
         self.root.title(f"FCUEX v{self.core.version} - Enhanced")
         self.root.geometry("800x600")
+        # One shared font object for the console widgets
+        self._mono = tkinter.font.Font(family="Consolas", size=10)
         
         # Main notebook for tabs
         self.notebook = ttk.Notebook(self.root)
@@ -34,22 +151,30 @@ class FCUEX_GUI:
         self.notebook.add(self.console_frame, text="Main Console")
         
         # Enhanced text area with scroll
-        self.text_area = scrolledtext.ScrolledText(
-            self.console_frame, 
+        # Plain Text plus a ttk scrollbar; ScrolledText adds a wrapper for nothing
+        text_frame = ttk.Frame(self.console_frame)
+        text_frame.pack(fill='both', expand=True, padx=5, pady=5)
+        self.text_area = tk.Text(
+            text_frame,
             wrap=tk.WORD,
             width=80,
             height=25,
-            font=("Consolas", 10)
+            font=self._mono
         )
-        self.text_area.pack(fill='both', expand=True, padx=5, pady=5)
+        scrollbar = ttk.Scrollbar(text_frame, command=self.text_area.yview)
+        self.text_area.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        self.text_area.pack(side='left', fill='both', expand=True)
         
         # Input frame
         input_frame = ttk.Frame(self.console_frame)
         input_frame.pack(fill='x', padx=5, pady=5)
         
-        self.cmd_entry = ttk.Entry(input_frame, font=("Consolas", 10))
+        self._cmd_var = tk.StringVar()
+        self.cmd_entry = ttk.Entry(input_frame, textvariable=self._cmd_var,
+                                   font=self._mono)
         self.cmd_entry.pack(side='left', fill='x', expand=True)
-        self.cmd_entry.bind('<Return>', self.execute_command)
+        self.root.bind_class('TEntry', '<Return>', self.execute_command)
         
         ttk.Button(input_frame, text="Execute", 
                   command=self.execute_command).pack(side='right', padx=5)
@@ -59,75 +184,172 @@ class FCUEX_GUI:
         self.notebook.add(self.tools_frame, text="Advanced Tools")
         self.setup_tools_tab()
         
-    def setup_tools_tab(self):
-        # File operations
-        file_frame = ttk.LabelFrame(self.tools_frame, text="File Operations")
-        file_frame.pack(fill='x', padx=10, pady=5)
-        
-        ttk.Button(file_frame, text="Load Binary File",
-                  command=self.load_binary).pack(side='left', padx=5, pady=5)
-        ttk.Button(file_frame, text="Export Data",
-                  command=self.export_data).pack(side='left', padx=5, pady=5)
-        
-        # System control
-        sys_frame = ttk.LabelFrame(self.tools_frame, text="System Control")
-        sys_frame.pack(fill='x', padx=10, pady=5)
+        # Settle geometry once after the whole tree is built
+        self.root.update_idletasks()
         
-        ttk.Button(sys_frame, text="Deep Analysis",
-                  command=self.deep_analysis).pack(side='left', padx=5, pady=5)
-        ttk.Button(sys_frame, text="Memory Scan",
-                  command=self.memory_scan).pack(side='left', padx=5, pady=5)
+    def setup_tools_tab(self):
+        for label, buttons in _TOOLS_LAYOUT:
+            # Frame padding stands in for the per-button pady
+            group = ttk.LabelFrame(self.tools_frame, text=label, padding=(0, 5))
+            group.pack(fill='x', padx=10, pady=5)
+            for text, handler in buttons:
+                ttk.Button(group, text=text,
+                           command=getattr(self, handler)).pack(side='left', padx=5)
         
     def load_features(self):
         """Enhanced features added to FCUEX 0.1"""
-        features = {
-            "binary_analysis": "Advanced binary data processing",
-            "memory_management": "Enhanced memory handling",
-            "real_time_monitor": "Live system monitoring",
-            "data_recovery": "Advanced data reconstruction",
-            "pattern_analysis": "Binary pattern recognition"
-        }
-        
-        for name, func in features.items():
-            self.core.add_module(name, func)
-            
-        self.log(f"FCUEX v{self.core.version} loaded with {len(features)} enhanced features")
+        self.core.add_modules(_FEATURES)
+        self.log(_LOAD_MSG)
         
     def execute_command(self, event=None):
-        cmd = self.cmd_entry.get()
-        if cmd:
-            result = self.core.execute_command(cmd)
-            self.log(f"> {cmd}\n{result}")
-            self.cmd_entry.delete(0, tk.END)
+        # <Return> is bound on the TEntry class; ignore it from other entries
+        if event is not None and event.widget is not self.cmd_entry:
+            return
+        cmd = self._cmd_var.get()
+        if not cmd:
+            return
+        self._cmd_var.set('')
+        result = self.core.execute_command(cmd)
+        self.log(f"> {cmd}\n{result}")
             
     def load_binary(self):
+        from tkinter import filedialog
         filename = filedialog.askopenfilename(
             title="Select Binary File",
-            filetypes=[("Binary files", "*.bin"), ("All files", "*.*")]
+            filetypes=_BIN_FILETYPES
         )
         if filename:
             self.log(f"Binary file selected: {filename}")
-            # Add binary processing logic here
+            self._work_q.put(('load', filename))
+
+    def _worker_loop(self):
+        while True:
+            job = self._work_q.get()
+            try:
+                getattr(self, f"_job_{job[0]}")(*job[1:])
+            except Exception as e:
+                self._result_q.put(('log', f"{job[0]} failed: {e}"))
+            # Threaded Tcl marshals this onto the Tk thread for us; once the main
+            # loop is gone (shutdown) there is nobody left to wake, so stop
+            try:
+                self.root.event_generate('<<WorkerResult>>', when='tail')
+            except (RuntimeError, tk.TclError):
+                return
+
+    def _job_load(self, path):
+        buf = bytearray()
+        for data in _raw_read(path):
+            buf += data
+        self._result_q.put(('loaded', (path, bytes(buf))))
+
+    def _job_deep(self, data):
+        if not data:
+            self._result_q.put(('log', "Deep analysis: no binary loaded"))
+            return
+        counts = collections.Counter(data)
+        n = len(data)
+        entropy = -sum(c / n * math.log2(c / n) for c in counts.values())
+        common, hits = counts.most_common(1)[0]
+        self._result_q.put(('log', f"Deep analysis: {n} bytes, {len(counts)} distinct, "
+                                   f"entropy {entropy:.3f} bits/byte, "
+                                   f"most common 0x{common:02X} ({hits}x)"))
+
+    def _cmd_find(self, rest):
+        try:
+            patterns = [bytes.fromhex(tok) for tok in rest.split()]
+        except ValueError:
+            return "Usage: find <hex> [<hex> ...]"
+        if not patterns:
+            return "Usage: find <hex> [<hex> ...]"
+        self._work_q.put(('find', self.binary_data, patterns))
+        return "Pattern analysis queued"
+
+    def _job_find(self, data, patterns):
+        for pat, offsets in find_patterns(data, patterns).items():
+            shown = ", ".join(f"0x{o:X}" for o in offsets[:16])
+            more = f" (+{len(offsets) - 16} more)" if len(offsets) > 16 else ""
+            self._result_q.put(('log', f"Pattern {pat.hex().upper()}: "
+                                       f"{len(offsets)} hit(s) {shown}{more}"))
+
+    def _job_scan(self, path):
+        if not path:
+            self._result_q.put(('log', "Memory scan: no binary loaded"))
+            return
+        # Stream the file through one reusable buffer instead of a new bytes per chunk
+        buf = self._scan_buf
+        mv = memoryview(buf)
+        total = zeros = 0
+        header = "no iNES header"
+        with io.BufferedReader(open(path, 'rb', buffering=0),
+                               buffer_size=SCAN_CHUNK) as reader:
+            while True:
+                n = reader.readinto(mv)
+                if not n:
+                    break
+                if not total and mv[:4] == b'NES\x1a':
+                    header = "iNES header found"
+                zeros += buf.count(0, 0, n)
+                total += n
+        self._result_q.put(('log', f"Memory scan: {header}, "
+                                   f"{zeros} zero bytes of {total}"))
+
+    def _poll_results(self, event=None):
+        while True:
+            try:
+                kind, value = self._result_q.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'loaded':
+                self.binary_path, self.binary_data = value
+                self.log(f"Binary file loaded: {len(self.binary_data)} bytes")
+            else:
+                self.log(value)
             
     def export_data(self):
+        from tkinter import filedialog
         filename = filedialog.asksaveasfilename(
             title="Export Data",
             defaultextension=".dat",
-            filetypes=[("Data files", "*.dat"), ("All files", "*.*")]
+            filetypes=_DAT_FILETYPES
         )
         if filename:
             self.log(f"Data export initiated: {filename}")
+            try:
+                if filename.lower().endswith(('.txt', '.log')):
+                    # Text exports get a fixed encoding rather than the locale default
+                    with open(filename, 'w', encoding='utf-8', newline='') as f:
+                        f.write(self.text_area.get('1.0', 'end-1c'))
+                else:
+                    _raw_write(filename, self.binary_data)
+            except OSError as e:
+                self.log(f"Export failed: {e}")
+            else:
+                self.log(f"Export complete: {filename}")
             
     def deep_analysis(self):
         self.log("Starting deep system analysis...")
-        # Implement analysis logic
+        self._work_q.put(('deep', self.binary_data))
         
     def memory_scan(self):
         self.log("Initiating memory scan...")
-        # Implement memory scanning
+        self._work_q.put(('scan', self.binary_path))
         
     def log(self, message):
-        self.text_area.insert(tk.END, f"{message}\n")
+        self._log_queue.append(f"{message}\n")
+        if not self._log_scheduled:
+            self._log_scheduled = True
+            self.root.after_idle(self._flush_log)
+
+    def _flush_log(self):
+        self._log_scheduled = False
+        if not self._log_queue:
+            return
+        blob = ''.join(self._log_queue)
+        self._log_queue.clear()
+        self.text_area.insert(tk.END, blob)
+        # Cap the scrollback so appends don't slow down as the widget grows
+        if int(self.text_area.index('end-1c').split('.')[0]) > MAX_LOG_LINES:
+            self.text_area.delete('1.0', f'end-{MAX_LOG_LINES}l')
         self.text_area.see(tk.END)
 
 def main():
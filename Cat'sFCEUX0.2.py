@@ -20,9 +20,14 @@
 #
 # -----------------------------
 
+from __future__ import annotations
+
 import tkinter as tk
 from tkinter import Menu, messagebox, filedialog, simpledialog
+import re
 import struct
+import queue
+import threading
 import numpy as np
 from typing import Optional, Tuple
 from PIL import Image, ImageTk
@@ -40,9 +45,18 @@ def hi(x: int) -> int:
 def lo(x: int) -> int:
     return x & 0xFF
 
+# CPU address-space mirroring: 2KB RAM repeats through 0x1FFF, the 8 PPU registers
+# through 0x3FFF; the stack is page 1 of RAM
+RAM_MASK = 0x7FF
+PPU_REG_MASK = 7
+STACK_BASE = 0x100
+
 # NTSC CPU cycles per frame ~ 29780.5; use 29781
 CPU_CYCLES_PER_FRAME = 29781
 
+# Most cycles a single CPU.step() can take (7: BRK, interrupts, indexed RMW)
+MAX_STEP_CYCLES = 7
+
 # NES master palette (64 colors). Values approximate gamma-adjusted sRGB.
 # Source: widely published approximations; fine-tuned for readability.
 NES_PALETTE = np.array([
@@ -64,10 +78,29 @@ NES_PALETTE = np.array([
     [160, 214, 228],[160, 162, 160],[  0,   0,   0],[  0,   0,   0],
 ], dtype=np.uint8)
 
+# Palette index -> packed 0xAABBGGRR (byte order R,G,B,A), for one-gather RGBA upload
+PALETTE_RGBA = (NES_PALETTE[:, 0].astype(np.uint32)
+                | (NES_PALETTE[:, 1].astype(np.uint32) << 8)
+                | (NES_PALETTE[:, 2].astype(np.uint32) << 16)
+                | np.uint32(0xFF000000))
+
+# Pattern byte -> its 8 pixel bits, leftmost pixel (bit 7) first. A tile row decodes
+# as BIT_LUT[lo] | (BIT_LUT[hi] << 1); gathering whole arrays of bytes decodes many rows.
+BIT_LUT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)
+
+def decode_tiles(chr_bytes: np.ndarray) -> np.ndarray:
+    # 16-byte planar tiles -> (n, 8, 8) 2-bit color indices, [tile, row, col]
+    planes = chr_bytes.reshape(-1, 2, 8)
+    return BIT_LUT[planes[:, 0]] | (BIT_LUT[planes[:, 1]] << 1)
+
 # ────────────────────────────────────────────────────────────────────────────────────
 # Controllers
 # ────────────────────────────────────────────────────────────────────────────────────
 
+# Button name -> its mask in the controller shift register
+_BUTTON_BIT = {'A': 0x01, 'B': 0x02, 'SELECT': 0x04, 'START': 0x08,
+               'UP': 0x10, 'DOWN': 0x20, 'LEFT': 0x40, 'RIGHT': 0x80}
+
 class Controller:
     def __init__(self, nes: 'NESBackend'):
         self.nes = nes
@@ -76,12 +109,8 @@ class Controller:
         self.shift = 0
 
     def set_button(self, name: str, pressed: bool):
-        bit = {'A':0,'B':1,'SELECT':2,'START':3,'UP':4,'DOWN':5,'LEFT':6,'RIGHT':7}.get(name, None)
-        if bit is None: return
-        if pressed:
-            self.buttons |= (1 << bit)
-        else:
-            self.buttons &= ~(1 << bit)
+        mask = _BUTTON_BIT.get(name, 0)
+        self.buttons = (self.buttons & ~mask) | (mask if pressed else 0)
 
     def write(self, value: int):
         self.strobe = value & 1
@@ -104,62 +133,92 @@ class BaseMapper:
         self.nes = nes
         self.id = mapper_id
         self.prg = bytearray(prg_rom)
+        size = max(1, prg_banks) * 0x4000
+        if len(self.prg) < size:
+            # Image shorter than the header claims: repeat it out to full size, so the
+            # modulo-free readers below see the same bytes as prg[off % len(prg)]
+            self.prg = (self.prg * (size // len(self.prg) + 1))[:size] if self.prg else bytearray(size)
+        self.prg_np = np.frombuffer(self.prg, dtype=np.uint8)
         self.chr = bytearray(chr_data if len(chr_data) else bytes(0x2000))
+        self.chr_np = np.frombuffer(self.chr, dtype=np.uint8)
+        # CHR sizes are powers of two on real carts: wrap with a mask, % only as a fallback
+        n = len(self.chr)
+        self.chr_mask = n - 1 if n & (n - 1) == 0 else None
+        # CHR decoded once up front; CHR RAM writes mark their tile for re-decoding
+        self.chr_pixels = decode_tiles(self.chr_np)
+        self._chr_dirty = set()
         self.prg_banks = max(1, prg_banks)
         self.chr_banks = max(1, chr_banks if len(chr_data) else 1)
         self.mirroring = mirroring  # 'H' or 'V'
         self.chr_is_ram = chr_is_ram
+        self.prg_bank_tag = 0  # identifies the current PRG mapping for the CPU block cache
+        # PRG offsets of the 16KB windows at 0x8000 and 0xC000; only bank switches change them
+        self._lo_base = 0
+        self._hi_base = (self.prg_banks - 1) * 0x4000
 
     # CPU PRG
     def cpu_read(self, addr: int) -> int:
-        raise NotImplementedError
+        if addr >= 0xC000:
+            return self.prg[self._hi_base + (addr & 0x3FFF)]
+        if addr >= 0x8000:
+            return self.prg[self._lo_base + (addr & 0x3FFF)]
+        return 0
+
+    def cpu_read_word(self, addr: int) -> int:
+        # Little-endian word at addr (0x8000+); the caller keeps both bytes in one 16KB window
+        i = (self._hi_base if addr >= 0xC000 else self._lo_base) + (addr & 0x3FFF)
+        prg = self.prg
+        return (prg[i + 1] << 8) | prg[i]
 
     def cpu_write(self, addr: int, value: int):
         pass
 
     # PPU CHR
     def ppu_read(self, addr: int) -> int:
-        return self.chr[addr % len(self.chr)]
+        m = self.chr_mask
+        return self.chr[addr & m] if m is not None else self.chr[addr % len(self.chr)]
 
     def ppu_write(self, addr: int, value: int):
         if self.chr_is_ram:
-            self.chr[addr % len(self.chr)] = value
+            m = self.chr_mask
+            i = addr & m if m is not None else addr % len(self.chr)
+            self.chr[i] = value
+            self._chr_dirty.add(i >> 4)
+
+    def _decoded(self) -> np.ndarray:
+        # chr_pixels with any tiles written since the last call re-decoded
+        if self._chr_dirty:
+            dirty = np.fromiter(self._chr_dirty, dtype=np.intp, count=len(self._chr_dirty))
+            self._chr_dirty.clear()
+            self.chr_pixels[dirty] = decode_tiles(self.chr_np.reshape(-1, 16)[dirty])
+        return self.chr_pixels
+
+    def chr_tiles(self) -> np.ndarray:
+        # Decoded (512, 8, 8) tiles currently mapped at PPU 0x0000-0x1FFF
+        pixels = self._decoded()
+        if len(pixels) >= 512:
+            return pixels[:512]
+        return np.resize(pixels, (512, 8, 8))
+
+    def get_tile_row(self, tile: int, fine_y: int) -> np.ndarray:
+        # 8 color indices of one pattern row; tile 0-511 spans both pattern tables
+        return self.chr_tiles()[tile, fine_y]
 
 class MapperNROM(BaseMapper):
-    # Mapper 0 (NROM) 16K/32K PRG, CHR ROM or CHR RAM
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.prg_bank_lo = 0
-        self.prg_bank_hi = self.prg_banks - 1
-
-    def cpu_read(self, addr: int) -> int:
-        if 0x8000 <= addr <= 0xBFFF:
-            off = self.prg_bank_lo * 0x4000 + (addr - 0x8000)
-            return self.prg[off % len(self.prg)]
-        elif 0xC000 <= addr <= 0xFFFF:
-            off = self.prg_bank_hi * 0x4000 + (addr - 0xC000)
-            return self.prg[off % len(self.prg)]
-        return 0
+    # Mapper 0 (NROM) 16K/32K PRG, CHR ROM or CHR RAM; 16K images mirror into 0xC000
+    pass
 
 class MapperUxROM(BaseMapper):
     # Mapper 2 (UxROM) - switch 16KB @ 0x8000, fixed 16KB @ 0xC000
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.bank = 0
-        self.fixed = self.prg_banks - 1
-
-    def cpu_read(self, addr: int) -> int:
-        if 0x8000 <= addr <= 0xBFFF:
-            off = self.bank * 0x4000 + (addr - 0x8000)
-            return self.prg[off % len(self.prg)]
-        elif 0xC000 <= addr <= 0xFFFF:
-            off = self.fixed * 0x4000 + (addr - 0xC000)
-            return self.prg[off % len(self.prg)]
-        return 0
 
     def cpu_write(self, addr: int, value: int):
         if 0x8000 <= addr <= 0xFFFF:
             self.bank = value & (self.prg_banks - 1)
+            self._lo_base = self.bank * 0x4000
+            self.prg_bank_tag = self.bank
 
 class MapperCNROM(BaseMapper):
     # Mapper 3 (CNROM) - switch 8KB CHR
@@ -173,7 +232,12 @@ class MapperCNROM(BaseMapper):
 
     def ppu_read(self, addr: int) -> int:
         bank_off = self.chr_bank * 0x2000
-        return self.chr[(bank_off + addr) % len(self.chr)]
+        m = self.chr_mask
+        return self.chr[(bank_off + addr) & m] if m is not None else self.chr[(bank_off + addr) % len(self.chr)]
+
+    def chr_tiles(self) -> np.ndarray:
+        tile_off = ((self.chr_bank * 0x2000) % len(self.chr)) >> 4
+        return self._decoded()[tile_off:tile_off + 512]
 
 def make_mapper(nes: 'NESBackend', mapper_id: int, prg_rom: bytes, chr_data: bytes, mirroring: str, chr_is_ram: bool) -> BaseMapper:
     prg_banks = max(1, len(prg_rom) // 0x4000)
@@ -191,6 +255,247 @@ def make_mapper(nes: 'NESBackend', mapper_id: int, prg_rom: bytes, chr_data: byt
 # CPU (6502) - official opcodes
 # ────────────────────────────────────────────────────────────────────────────────────
 
+# Declarative opcode spec: (opcode, mnemonic, addressing mode, base cycles, +1 cycle on page cross)
+OPCODES = (
+    (0x00,'BRK','imp', 7,0), (0x18,'CLC','imp', 2,0), (0x38,'SEC','imp', 2,0),
+    (0x58,'CLI','imp', 2,0), (0x78,'SEI','imp', 2,0), (0xB8,'CLV','imp', 2,0),
+    (0xD8,'CLD','imp', 2,0), (0xF8,'SED','imp', 2,0), (0xEA,'NOP','imp', 2,0),
+    (0xAA,'TAX','imp', 2,0), (0x8A,'TXA','imp', 2,0), (0xCA,'DEX','imp', 2,0),
+    (0xE8,'INX','imp', 2,0), (0xA8,'TAY','imp', 2,0), (0x98,'TYA','imp', 2,0),
+    (0x88,'DEY','imp', 2,0), (0xC8,'INY','imp', 2,0), (0x9A,'TXS','imp', 2,0),
+    (0xBA,'TSX','imp', 2,0), (0x48,'PHA','imp', 3,0), (0x68,'PLA','imp', 4,0),
+    (0x08,'PHP','imp', 3,0), (0x28,'PLP','imp', 4,0), (0x40,'RTI','imp', 6,0),
+    (0x60,'RTS','imp', 6,0), (0x20,'JSR','abs', 6,0), (0x10,'BPL','rel', 2,0),
+    (0x30,'BMI','rel', 2,0), (0x50,'BVC','rel', 2,0), (0x70,'BVS','rel', 2,0),
+    (0x90,'BCC','rel', 2,0), (0xB0,'BCS','rel', 2,0), (0xD0,'BNE','rel', 2,0),
+    (0xF0,'BEQ','rel', 2,0),
+    (0x4C,'JMP','abs', 3,0), (0x6C,'JMP','ind', 5,0),
+    (0xA1,'LDA','indx',6,0), (0xA5,'LDA','zp',  3,0), (0xA9,'LDA','imm', 2,0),
+    (0xAD,'LDA','abs', 4,0), (0xB1,'LDA','indy',5,1), (0xB5,'LDA','zpx', 4,0),
+    (0xB9,'LDA','absy',4,1), (0xBD,'LDA','absx',4,1),
+    (0xA2,'LDX','imm', 2,0), (0xA6,'LDX','zp',  3,0), (0xAE,'LDX','abs', 4,0),
+    (0xB6,'LDX','zpy', 4,0), (0xBE,'LDX','absy',4,1),
+    (0xA0,'LDY','imm', 2,0), (0xA4,'LDY','zp',  3,0), (0xAC,'LDY','abs', 4,0),
+    (0xB4,'LDY','zpx', 4,0), (0xBC,'LDY','absx',4,1),
+    (0x81,'STA','indx',6,0), (0x85,'STA','zp',  3,0), (0x8D,'STA','abs', 4,0),
+    (0x91,'STA','indy',6,0), (0x95,'STA','zpx', 4,0), (0x99,'STA','absy',5,0),
+    (0x9D,'STA','absx',5,0),
+    (0x86,'STX','zp',  3,0), (0x8E,'STX','abs', 4,0), (0x96,'STX','zpy', 4,0),
+    (0x84,'STY','zp',  3,0), (0x8C,'STY','abs', 4,0), (0x94,'STY','zpx', 4,0),
+    (0x61,'ADC','indx',6,0), (0x65,'ADC','zp',  3,0), (0x69,'ADC','imm', 2,0),
+    (0x6D,'ADC','abs', 4,0), (0x71,'ADC','indy',5,1), (0x75,'ADC','zpx', 4,0),
+    (0x79,'ADC','absy',4,1), (0x7D,'ADC','absx',4,1),
+    (0xE1,'SBC','indx',6,0), (0xE5,'SBC','zp',  3,0), (0xE9,'SBC','imm', 2,0),
+    (0xED,'SBC','abs', 4,0), (0xF1,'SBC','indy',5,1), (0xF5,'SBC','zpx', 4,0),
+    (0xF9,'SBC','absy',4,1), (0xFD,'SBC','absx',4,1),
+    (0x21,'AND','indx',6,0), (0x25,'AND','zp',  3,0), (0x29,'AND','imm', 2,0),
+    (0x2D,'AND','abs', 4,0), (0x31,'AND','indy',5,1), (0x35,'AND','zpx', 4,0),
+    (0x39,'AND','absy',4,1), (0x3D,'AND','absx',4,1),
+    (0x01,'ORA','indx',6,0), (0x05,'ORA','zp',  3,0), (0x09,'ORA','imm', 2,0),
+    (0x0D,'ORA','abs', 4,0), (0x11,'ORA','indy',5,1), (0x15,'ORA','zpx', 4,0),
+    (0x19,'ORA','absy',4,1), (0x1D,'ORA','absx',4,1),
+    (0x41,'EOR','indx',6,0), (0x45,'EOR','zp',  3,0), (0x49,'EOR','imm', 2,0),
+    (0x4D,'EOR','abs', 4,0), (0x51,'EOR','indy',5,1), (0x55,'EOR','zpx', 4,0),
+    (0x59,'EOR','absy',4,1), (0x5D,'EOR','absx',4,1),
+    (0xC1,'CMP','indx',6,0), (0xC5,'CMP','zp',  3,0), (0xC9,'CMP','imm', 2,0),
+    (0xCD,'CMP','abs', 4,0), (0xD1,'CMP','indy',5,1), (0xD5,'CMP','zpx', 4,0),
+    (0xD9,'CMP','absy',4,1), (0xDD,'CMP','absx',4,1),
+    (0xE0,'CPX','imm', 2,0), (0xE4,'CPX','zp',  3,0), (0xEC,'CPX','abs', 4,0),
+    (0xC0,'CPY','imm', 2,0), (0xC4,'CPY','zp',  3,0), (0xCC,'CPY','abs', 4,0),
+    (0x24,'BIT','zp',  3,0), (0x2C,'BIT','abs', 4,0),
+    (0xE6,'INC','zp',  5,0), (0xEE,'INC','abs', 6,0), (0xF6,'INC','zpx', 6,0),
+    (0xFE,'INC','absx',7,0),
+    (0xC6,'DEC','zp',  5,0), (0xCE,'DEC','abs', 6,0), (0xD6,'DEC','zpx', 6,0),
+    (0xDE,'DEC','absx',7,0),
+    (0x06,'ASL','zp',  5,0), (0x0A,'ASL','acc', 2,0), (0x0E,'ASL','abs', 6,0),
+    (0x16,'ASL','zpx', 6,0), (0x1E,'ASL','absx',7,0),
+    (0x46,'LSR','zp',  5,0), (0x4A,'LSR','acc', 2,0), (0x4E,'LSR','abs', 6,0),
+    (0x56,'LSR','zpx', 6,0), (0x5E,'LSR','absx',7,0),
+    (0x26,'ROL','zp',  5,0), (0x2A,'ROL','acc', 2,0), (0x2E,'ROL','abs', 6,0),
+    (0x36,'ROL','zpx', 6,0), (0x3E,'ROL','absx',7,0),
+    (0x66,'ROR','zp',  5,0), (0x6A,'ROR','acc', 2,0), (0x6E,'ROR','abs', 6,0),
+    (0x76,'ROR','zpx', 6,0), (0x7E,'ROR','absx',7,0),
+)
+
+ADDR_MODES = ('imp', 'acc', 'imm', 'zp', 'zpx', 'zpy', 'abs', 'absx', 'absy', 'ind', 'indx', 'indy', 'rel')
+
+def _build_opcode_tables():
+    # Unlisted (illegal) opcodes decode as a 2-cycle implied NOP
+    names = ['NOP'] * 256
+    modes = bytearray(256)
+    cycles = bytearray([2] * 256)
+    pagecross = bytearray(256)
+    for op, name, mode, cyc, px in OPCODES:
+        names[op] = name
+        modes[op] = ADDR_MODES.index(mode)
+        cycles[op] = cyc
+        pagecross[op] = px
+    return tuple(names), bytes(modes), bytes(cycles), bytes(pagecross)
+
+OPCODE_NAME, OPCODE_MODE, OPCODE_CYCLES, OPCODE_PAGECROSS = _build_opcode_tables()
+
+# Result byte -> its N and Z flag bits, merged into P with (P & 0x7D) | _NZ[v]
+_NZ = bytes((0x80 if v & 0x80 else 0) | (0x02 if v == 0 else 0) for v in range(256))
+
+# Basic-block compiler support
+_MODE_SIZE = {'imp': 1, 'acc': 1, 'imm': 2, 'zp': 2, 'zpx': 2, 'zpy': 2, 'abs': 3,
+              'absx': 3, 'absy': 3, 'ind': 3, 'indx': 2, 'indy': 2, 'rel': 2}
+_BRANCHES = frozenset(('BPL', 'BMI', 'BVC', 'BVS', 'BCC', 'BCS', 'BNE', 'BEQ'))
+_BLOCK_ENDERS = frozenset(('JMP', 'JSR', 'RTS', 'RTI', 'BRK')) | _BRANCHES
+_MEM_WRITERS = frozenset(('STA', 'STX', 'STY', 'INC', 'DEC', 'ASL', 'LSR', 'ROL', 'ROR'))
+MAX_BLOCK_INSNS = 64
+
+# Instruction bodies, shared by the generated interpreter (STEP_FNS) and the block
+# compiler. Registers live in the locals A, X, Y, P; each entry lists the registers it
+# writes and its lines, where {v} is the operand value and {m} the RAM cell (or A) that
+# stores and read-modify-writes target.
+_INLINE = {
+    'LDA': ('AP', ('A = {v}', 'P = (P & 0x7D) | NZ[A]')),
+    'LDX': ('XP', ('X = {v}', 'P = (P & 0x7D) | NZ[X]')),
+    'LDY': ('YP', ('Y = {v}', 'P = (P & 0x7D) | NZ[Y]')),
+    'STA': ('', ('{m} = A',)),
+    'STX': ('', ('{m} = X',)),
+    'STY': ('', ('{m} = Y',)),
+    'AND': ('AP', ('A &= {v}', 'P = (P & 0x7D) | NZ[A]')),
+    'ORA': ('AP', ('A |= {v}', 'P = (P & 0x7D) | NZ[A]')),
+    'EOR': ('AP', ('A ^= {v}', 'P = (P & 0x7D) | NZ[A]')),
+    'ADC': ('AP', ('v = {v}', 'r = A + v + (P & 1)',
+                   'P = (P & 0x3C) | (r >> 8) | ((~(A ^ v) & (A ^ r) & 0x80) >> 1)',
+                   'A = r & 0xFF', 'P |= NZ[A]')),
+    'SBC': ('AP', ('v = {v} ^ 0xFF', 'r = A + v + (P & 1)',
+                   'P = (P & 0x3C) | (r >> 8) | ((~(A ^ v) & (A ^ r) & 0x80) >> 1)',
+                   'A = r & 0xFF', 'P |= NZ[A]')),
+    'CMP': ('P', ('v = {v}', 'P = (P & 0x7C) | NZ[(A - v) & 0xFF] | (A >= v)')),
+    'CPX': ('P', ('v = {v}', 'P = (P & 0x7C) | NZ[(X - v) & 0xFF] | (X >= v)')),
+    'CPY': ('P', ('v = {v}', 'P = (P & 0x7C) | NZ[(Y - v) & 0xFF] | (Y >= v)')),
+    'BIT': ('P', ('v = {v}', 'P = (P & 0x3D) | (v & 0xC0) | (0 if A & v else 0x02)')),
+    'INC': ('P', ('v = ({m} + 1) & 0xFF', '{m} = v', 'P = (P & 0x7D) | NZ[v]')),
+    'DEC': ('P', ('v = ({m} - 1) & 0xFF', '{m} = v', 'P = (P & 0x7D) | NZ[v]')),
+    'ASL': ('P', ('v = {m} << 1', 'P = (P & 0x7C) | (v >> 8)', 'v &= 0xFF', '{m} = v', 'P |= NZ[v]')),
+    'LSR': ('P', ('r = {m}', 'v = r >> 1', 'P = (P & 0x7C) | (r & 1) | NZ[v]', '{m} = v')),
+    'ROL': ('P', ('v = ({m} << 1) | (P & 1)', 'P = (P & 0x7C) | (v >> 8)', 'v &= 0xFF', '{m} = v', 'P |= NZ[v]')),
+    'ROR': ('P', ('r = {m}', 'v = (r >> 1) | ((P & 1) << 7)', 'P = (P & 0x7C) | (r & 1) | NZ[v]', '{m} = v')),
+    'TAX': ('XP', ('X = A', 'P = (P & 0x7D) | NZ[X]')),
+    'TXA': ('AP', ('A = X', 'P = (P & 0x7D) | NZ[A]')),
+    'TAY': ('YP', ('Y = A', 'P = (P & 0x7D) | NZ[Y]')),
+    'TYA': ('AP', ('A = Y', 'P = (P & 0x7D) | NZ[A]')),
+    'TSX': ('XP', ('X = cpu.sp', 'P = (P & 0x7D) | NZ[X]')),
+    'TXS': ('', ('cpu.sp = X',)),
+    'INX': ('XP', ('X = (X + 1) & 0xFF', 'P = (P & 0x7D) | NZ[X]')),
+    'DEX': ('XP', ('X = (X - 1) & 0xFF', 'P = (P & 0x7D) | NZ[X]')),
+    'INY': ('YP', ('Y = (Y + 1) & 0xFF', 'P = (P & 0x7D) | NZ[Y]')),
+    'DEY': ('YP', ('Y = (Y - 1) & 0xFF', 'P = (P & 0x7D) | NZ[Y]')),
+    'CLC': ('P', ('P &= 0xFE',)), 'SEC': ('P', ('P |= 0x01',)),
+    'CLI': ('P', ('P &= 0xFB',)), 'SEI': ('P', ('P |= 0x04',)),
+    'CLV': ('P', ('P &= 0xBF',)),
+    'CLD': ('P', ('P &= 0xF7',)), 'SED': ('P', ('P |= 0x08',)),
+    'NOP': ('', ()),
+    'PHA': ('', ('s = cpu.sp', f'ram[{STACK_BASE} + s] = A', 'cpu.sp = (s - 1) & 0xFF')),
+    'PHP': ('', ('s = cpu.sp', f'ram[{STACK_BASE} + s] = P | 0x30', 'cpu.sp = (s - 1) & 0xFF')),
+    'PLA': ('AP', ('s = cpu.sp = (cpu.sp + 1) & 0xFF', f'A = ram[{STACK_BASE} + s]', 'P = (P & 0x7D) | NZ[A]')),
+    'PLP': ('P', ('s = cpu.sp = (cpu.sp + 1) & 0xFF', f'P = (ram[{STACK_BASE} + s] | 0x20) & 0xEF')),
+    'RTS': ('', ('s = cpu.sp',
+                 f'cpu.pc = (((ram[{STACK_BASE} + ((s + 2) & 0xFF)] << 8) | ram[{STACK_BASE} + ((s + 1) & 0xFF)]) + 1) & 0xFFFF',
+                 'cpu.sp = (s + 2) & 0xFF')),
+    'RTI': ('P', ('s = cpu.sp', f'P = (ram[{STACK_BASE} + ((s + 1) & 0xFF)] | 0x20) & 0xEF',
+                  f'cpu.pc = (ram[{STACK_BASE} + ((s + 3) & 0xFF)] << 8) | ram[{STACK_BASE} + ((s + 2) & 0xFF)]',
+                  'cpu.sp = (s + 3) & 0xFF')),
+}
+_REG_ATTR = {'A': 'a', 'X': 'x', 'Y': 'y', 'P': 'flags'}
+# Branch opcode -> (flag mask, expected value); taken when (P & mask) == expected
+_BR = {0x10: (0x80, 0x00), 0x30: (0x80, 0x80), 0x50: (0x40, 0x00), 0x70: (0x40, 0x40),
+       0x90: (0x01, 0x00), 0xB0: (0x01, 0x01), 0xD0: (0x02, 0x00), 0xF0: (0x02, 0x02)}
+
+# Operand setup per addressing mode for the generated interpreter. `pc` is the address
+# after the opcode byte; each leaves the effective address in `a`, and the indexed
+# modes keep the unindexed base in `b` for the page-cross test.
+_STEP_MODE = {
+    'imp': (), 'acc': (),
+    'imm': ('cpu.pc = (pc + 1) & 0xFFFF', 'a = pc'),
+    'zp': ('cpu.pc = (pc + 1) & 0xFFFF', 'a = read(pc)'),
+    'zpx': ('cpu.pc = (pc + 1) & 0xFFFF', 'a = (read(pc) + X) & 0xFF'),
+    'zpy': ('cpu.pc = (pc + 1) & 0xFFFF', 'a = (read(pc) + Y) & 0xFF'),
+    'abs': ('cpu.pc = (pc + 2) & 0xFFFF', 'a = cpu.read_word(pc)'),
+    'absx': ('cpu.pc = (pc + 2) & 0xFFFF', 'b = cpu.read_word(pc)', 'a = (b + X) & 0xFFFF'),
+    'absy': ('cpu.pc = (pc + 2) & 0xFFFF', 'b = cpu.read_word(pc)', 'a = (b + Y) & 0xFFFF'),
+    # 6502 indirect bug: the high byte is fetched without carrying into the page
+    'ind': ('cpu.pc = (pc + 2) & 0xFFFF', 'b = cpu.read_word(pc)',
+            'a = (read((b & 0xFF00) | ((b + 1) & 0xFF)) << 8) | read(b)'),
+    'indx': ('cpu.pc = (pc + 1) & 0xFFFF', 'z = (read(pc) + X) & 0xFF',
+             'a = (ram[(z + 1) & 0xFF] << 8) | ram[z]'),
+    'indy': ('cpu.pc = (pc + 1) & 0xFFFF', 'z = read(pc)',
+             'b = (ram[(z + 1) & 0xFF] << 8) | ram[z]', 'a = (b + Y) & 0xFFFF'),
+    'rel': ('cpu.pc = npc = (pc + 1) & 0xFFFF', 'o = read(pc)',
+            'a = (npc + o - ((o & 0x80) << 1)) & 0xFFFF'),
+}
+
+def _step_source(op: int) -> str:
+    # Python source for one opcode: def op_XX(cpu) -> cycles, entered with cpu.pc past
+    # the opcode byte. Instruction bodies come from _INLINE, shared with the block compiler.
+    name = OPCODE_NAME[op]
+    mode = ADDR_MODES[OPCODE_MODE[op]]
+    cycles = OPCODE_CYCLES[op]
+    body = list(_STEP_MODE[mode])
+    ret = str(cycles)
+    if OPCODE_PAGECROSS[op]:
+        body.append(f'c = {cycles} + ((a ^ b) >> 8 and 1)')
+        ret = 'c'
+    writes = ''
+    if op in _BR:
+        mask, expect = _BR[op]
+        body += [f'if (P & 0x{mask:02X}) == 0x{expect:02X}:',
+                 '    cpu.pc = a',
+                 f'    return {cycles} + (2 if (npc ^ a) & 0xFF00 else 1)']
+    elif name == 'JMP':
+        body.append('cpu.pc = a')
+    elif name == 'JSR':
+        body += ['r = (pc + 1) & 0xFFFF', 's = cpu.sp',
+                 f'ram[{STACK_BASE} + s] = r >> 8; ram[{STACK_BASE} + ((s - 1) & 0xFF)] = r & 0xFF',
+                 'cpu.sp = (s - 2) & 0xFF', 'cpu.pc = a']
+    elif name == 'BRK':
+        body += ['cpu.pc = (pc + 1) & 0xFFFF  # skip padding byte like real 6502',
+                 'cpu.do_interrupt(0xFFFE, 0x10)']
+    else:
+        writes, lines = _INLINE[name]
+        if mode == 'acc':
+            lines = [ln.format(m='A') for ln in lines]
+            writes += 'A'
+        elif mode in ('zp', 'zpx', 'zpy'):
+            lines = [ln.format(v='ram[a]', m='ram[a]') for ln in lines]
+        else:
+            # Address only known at run time: go through the bus
+            lines = [f'write(a, {ln[6:]})' if ln.startswith('{m} = ') else
+                     ln.format(v='read(a)', m='read(a)') for ln in lines]
+        body += lines
+    body += [f'cpu.{_REG_ATTR[r]} = {r}' for r in 'AXYP' if r in writes]
+    body.append(f'return {ret}')
+
+    text = '\n'.join(body)
+    head = ['pc = cpu.pc'] if re.search(r'(?<![.\w])pc\b', text) else []
+    for local, attr in (('read', 'cpu.read'), ('write', 'cpu.write'), ('ram', 'cpu.nes.ram')):
+        if re.search(rf'\b{local}[\[(]', text):
+            head.append(f'{local} = {attr}')
+    head += [f'{r} = cpu.{_REG_ATTR[r]}' for r in 'AXYP' if re.search(rf'\b{r}\b', text)]
+    return '\n'.join([f'def op_{op:02X}(cpu):'] + ['    ' + ln for ln in head + body])
+
+def _build_step_fns() -> list:
+    ns = {'NZ': _NZ}
+    exec(compile('\n\n'.join(_step_source(op) for op in range(256)), '<6502 step>', 'exec'), ns)
+    return [ns['op_%02X' % op] for op in range(256)]
+
+# Opcode -> fn(cpu) -> cycles, generated from OPCODES/_INLINE at import
+STEP_FNS = _build_step_fns()
+
+class Block:
+    """A straight-line run of PRG instructions compiled into one Python function."""
+    __slots__ = ('fn', 'end_pc', 'cycles', 'max_cycles')
+
+    def __init__(self, fn, end_pc: int, cycles: int, max_cycles: int):
+        self.fn = fn                  # fn(cpu) -> cycles taken; updates cpu.cycles itself
+        self.end_pc = end_pc
+        self.cycles = cycles          # static cycle count
+        self.max_cycles = max_cycles  # worst case incl. page-cross / taken-branch penalties
+
 class CPU:
     def __init__(self, nes: 'NESBackend'):
         self.nes = nes
@@ -204,65 +509,86 @@ class CPU:
         self.stall = 0
         self.nmi_pending = False
         self.irq_pending = False
+        self.block_cache = {}  # (prg_bank_tag << 16 | pc) -> Block
 
     # Flag bits
     C=0x01; Z=0x02; I=0x04; D=0x08; B=0x10; U=0x20; V=0x40; N=0x80
 
-    # Bus access
+    # Bus access: one handler per 4KB page, rebuilt by map_bus() when the mapper changes
+    def map_bus(self):
+        nes = self.nes
+        ram, sram, ppu, apu = nes.ram, nes.sram, nes.ppu, nes.apu
+        pad1, pad2 = nes.controller1, nes.controller2
+
+        # Masks and objects are bound as defaults so each handler body is locals only
+        def read_ram(a, ram=ram, m=RAM_MASK): return ram[a & m]
+        def write_ram(a, v, ram=ram, m=RAM_MASK): ram[a & m] = v
+        def read_ppu(a, read_reg=ppu.read_reg, m=PPU_REG_MASK): return read_reg(a & m)
+        def write_ppu(a, v, write_reg=ppu.write_reg, m=PPU_REG_MASK): write_reg(a & m, v)
+        def read_sram(a, sram=sram): return sram[a - 0x6000]
+        def write_sram(a, v, sram=sram): sram[a - 0x6000] = v
+        def read_open(a): return 0
+        def write_open(a, v): pass
+
+        def read_io(a):
+            if a == 0x4016:
+                return pad1.read()
+            elif a == 0x4017:
+                return pad2.read()
+            elif a <= 0x4017:
+                return apu.read_reg(a)
+            return 0
+
+        def write_io(a, v):
+            if a == 0x4014:
+                # OAM DMA
+                ppu.do_oam_dma(v)
+                # Stall CPU for 513 or 514 cycles depending on alignment
+                self.stall += 513 + (1 if (self.cycles & 1) else 0)
+            elif a == 0x4016:
+                pad1.write(v)
+            elif a == 0x4017:
+                pad2.write(v)
+            elif a <= 0x4017:
+                apu.write_reg(a, v)
+
+        mapper = nes.mapper
+        read_rom = mapper.cpu_read if mapper else read_open
+        write_rom = mapper.cpu_write if mapper else write_open
+        self._read_page = [read_ram, read_ram, read_ppu, read_ppu, read_io, read_open,
+                           read_sram, read_sram] + [read_rom] * 8
+        self._write_page = [write_ram, write_ram, write_ppu, write_ppu, write_io, write_open,
+                            write_sram, write_sram] + [write_rom] * 8
+
     def read(self, addr: int) -> int:
         a = addr & 0xFFFF
-        if a < 0x2000:
-            return self.nes.ram[a & 0x7FF]
-        elif 0x2000 <= a <= 0x3FFF:
-            return self.nes.ppu.read_reg( a & 7 )
-        elif a == 0x4016:
-            return self.nes.controller1.read()
-        elif a == 0x4017:
-            return self.nes.controller2.read()
-        elif 0x4000 <= a <= 0x4017:
-            return self.nes.apu.read_reg(a)
-        elif 0x6000 <= a <= 0x7FFF:
-            return self.nes.sram[a - 0x6000]
-        elif a >= 0x8000:
-            return self.nes.mapper.cpu_read(a)
-        else:
-            return 0
+        return self._read_page[a >> 12](a)
 
     def write(self, addr: int, value: int):
         a = addr & 0xFFFF
-        v = value & 0xFF
-        if a < 0x2000:
-            self.nes.ram[a & 0x7FF] = v
-        elif 0x2000 <= a <= 0x3FFF:
-            self.nes.ppu.write_reg(a & 7, v)
-        elif a == 0x4014:
-            # OAM DMA
-            self.nes.ppu.do_oam_dma(v)
-            # Stall CPU for 513 or 514 cycles depending on alignment
-            self.stall += 513 + (1 if (self.cycles & 1) else 0)
-        elif a == 0x4016:
-            self.nes.controller1.write(v)
-        elif a == 0x4017:
-            self.nes.controller2.write(v)
-        elif 0x4000 <= a <= 0x4017:
-            self.nes.apu.write_reg(a, v)
-        elif 0x6000 <= a <= 0x7FFF:
-            self.nes.sram[a - 0x6000] = v
-        elif a >= 0x8000:
-            self.nes.mapper.cpu_write(a, v)
+        self._write_page[a >> 12](a, value & 0xFF)
 
     def read_word(self, addr: int) -> int:
+        # Both bytes in the same RAM mirror or PRG window: no MMIO side effects, so
+        # fetch them directly instead of dispatching two bus reads
+        if addr >= 0x8000:
+            if addr & 0x3FFF != 0x3FFF:
+                return self.nes.mapper.cpu_read_word(addr)
+        elif addr < 0x2000 and addr & RAM_MASK != RAM_MASK:
+            ram = self.nes.ram
+            i = addr & RAM_MASK
+            return (ram[i + 1] << 8) | ram[i]
         lo_ = self.read(addr)
         hi_ = self.read(addr+1)
         return (hi_ << 8) | lo_
 
     def push(self, v: int):
-        self.nes.ram[0x100 + (self.sp & 0xFF)] = v & 0xFF
+        self.nes.ram[STACK_BASE + (self.sp & 0xFF)] = v & 0xFF
         self.sp = (self.sp - 1) & 0xFF
 
     def pull(self) -> int:
         self.sp = (self.sp + 1) & 0xFF
-        return self.nes.ram[0x100 + (self.sp & 0xFF)]
+        return self.nes.ram[STACK_BASE + (self.sp & 0xFF)]
 
     def set_flag(self, m: int, c: bool):
         if c: self.flags |= m
@@ -271,14 +597,11 @@ class CPU:
     def get_flag(self, m: int) -> int:
         return 1 if (self.flags & m) else 0
 
-    def update_zn(self, v: int):
-        self.set_flag(self.Z, (v & 0xFF) == 0)
-        self.set_flag(self.N, (v & 0x80) != 0)
-
     def reset(self):
         self.sp = 0xFD
         self.flags = 0x24
         self.a = self.x = self.y = 0
+        self.map_bus()
         self.pc = self.read_word(0xFFFC)
         if self.pc < 0x8000:
             # Some homebrew/test ROMs expect reset at C000 when vectors mirror to ROM end
@@ -287,6 +610,7 @@ class CPU:
         self.stall = 0
         self.nmi_pending = False
         self.irq_pending = False
+        self.block_cache = {}
 
     # Interrupts
     def nmi(self):
@@ -306,61 +630,6 @@ class CPU:
         self.push(f)
         self.set_flag(self.I, True)
         self.pc = self.read_word(vector_addr)
-        self.cycles += 7
-
-    # Addressing helpers
-    def fetch_imm(self) -> Tuple[int, Optional[int], bool]:
-        v = self.read(self.pc); self.pc = (self.pc + 1) & 0xFFFF
-        return v, None, False
-
-    def fetch_zp(self) -> Tuple[int, int, bool]:
-        a = self.read(self.pc); self.pc = (self.pc + 1) & 0xFFFF
-        return self.read(a), a, False
-
-    def fetch_zpx(self) -> Tuple[int, int, bool]:
-        a = (self.read(self.pc) + self.x) & 0xFF; self.pc = (self.pc + 1) & 0xFFFF
-        return self.read(a), a, False
-
-    def fetch_zpy(self) -> Tuple[int, int, bool]:
-        a = (self.read(self.pc) + self.y) & 0xFF; self.pc = (self.pc + 1) & 0xFFFF
-        return self.read(a), a, False
-
-    def fetch_abs(self) -> Tuple[int, int, bool]:
-        a = self.read_word(self.pc); self.pc = (self.pc + 2) & 0xFFFF
-        return self.read(a), a, False
-
-    def fetch_absx(self) -> Tuple[int, int, bool]:
-        base = self.read_word(self.pc); self.pc = (self.pc + 2) & 0xFFFF
-        a = (base + self.x) & 0xFFFF
-        crossed = ((base & 0xFF00) != (a & 0xFF00))
-        return self.read(a), a, crossed
-
-    def fetch_absy(self) -> Tuple[int, int, bool]:
-        base = self.read_word(self.pc); self.pc = (self.pc + 2) & 0xFFFF
-        a = (base + self.y) & 0xFFFF
-        crossed = ((base & 0xFF00) != (a & 0xFF00))
-        return self.read(a), a, crossed
-
-    def fetch_ind(self) -> int:
-        ptr = self.read_word(self.pc); self.pc = (self.pc + 2) & 0xFFFF
-        # 6502 indirect bug: page wrap for low byte fetch
-        lo_addr = ptr
-        hi_addr = (ptr & 0xFF00) | ((ptr + 1) & 0xFF)
-        return (self.read(hi_addr) << 8) | self.read(lo_addr)
-
-    def fetch_indx(self) -> Tuple[int, int, bool]:
-        zp = (self.read(self.pc) + self.x) & 0xFF; self.pc = (self.pc + 1) & 0xFFFF
-        lo_ = self.read(zp); hi_ = self.read((zp + 1) & 0xFF)
-        a = ((hi_ << 8) | lo_) & 0xFFFF
-        return self.read(a), a, False
-
-    def fetch_indy(self) -> Tuple[int, int, bool]:
-        zp = self.read(self.pc); self.pc = (self.pc + 1) & 0xFFFF
-        lo_ = self.read(zp); hi_ = self.read((zp + 1) & 0xFF)
-        base = ((hi_ << 8) | lo_) & 0xFFFF
-        a = (base + self.y) & 0xFFFF
-        crossed = ((base & 0xFF00) != (a & 0xFF00))
-        return self.read(a), a, crossed
 
     # Core execution
     def step(self) -> int:
@@ -374,308 +643,250 @@ class CPU:
         if self.nmi_pending:
             self.nmi_pending = False
             self.do_interrupt(0xFFFA, 0)  # BRK flag not set for NMI
+            self.cycles += 7
             return 7
         if self.irq_pending and not self.get_flag(self.I):
             self.irq_pending = False
             self.do_interrupt(0xFFFE, 0)
+            self.cycles += 7
             return 7
 
-        op = self.read(self.pc); self.pc = (self.pc + 1) & 0xFFFF
-
-        # Generated decode covering official instruction set. Invalid opcodes -> NOP (2 cycles).
-        # To keep code size contained, we implement by groups.
-        c = 0  # cycles this instruction
-
-        # --- Single-byte implied/accumulator ---
-        if op == 0x00:  # BRK
-            self.pc = (self.pc + 1) & 0xFFFF  # skip padding byte like real 6502
-            self.do_interrupt(0xFFFE, self.B)
-            return 7
-        elif op == 0x18: self.set_flag(self.C, False); c=2
-        elif op == 0x38: self.set_flag(self.C, True);  c=2
-        elif op == 0x58: self.set_flag(self.I, False); c=2
-        elif op == 0x78: self.set_flag(self.I, True);  c=2
-        elif op == 0xB8: self.set_flag(self.V, False); c=2
-        elif op == 0xD8: self.set_flag(self.D, False); c=2
-        elif op == 0xF8: self.set_flag(self.D, True);  c=2
-        elif op == 0xEA: c=2  # NOP
-        elif op == 0xAA: self.x = self.a; self.update_zn(self.x); c=2  # TAX
-        elif op == 0x8A: self.a = self.x; self.update_zn(self.a); c=2  # TXA
-        elif op == 0xCA: self.x = clamp8(self.x - 1); self.update_zn(self.x); c=2  # DEX
-        elif op == 0xE8: self.x = clamp8(self.x + 1); self.update_zn(self.x); c=2  # INX
-        elif op == 0xA8: self.y = self.a; self.update_zn(self.y); c=2  # TAY
-        elif op == 0x98: self.a = self.y; self.update_zn(self.a); c=2  # TYA
-        elif op == 0x88: self.y = clamp8(self.y - 1); self.update_zn(self.y); c=2  # DEY
-        elif op == 0xC8: self.y = clamp8(self.y + 1); self.update_zn(self.y); c=2  # INY
-        elif op == 0x9A: self.sp = self.x; c=2  # TXS
-        elif op == 0xBA: self.x = self.sp; self.update_zn(self.x); c=2  # TSX
-        elif op == 0x48: self.push(self.a); c=3  # PHA
-        elif op == 0x68: self.a = self.pull(); self.update_zn(self.a); c=4  # PLA
-        elif op == 0x08: self.push(self.flags | self.B | self.U); c=3  # PHP
-        elif op == 0x28:
-            self.flags = (self.pull() | self.U) & 0xEF  # PLP
-            c=4
-        elif op == 0x40:
-            # RTI
-            self.flags = (self.pull() | self.U) & 0xEF
-            lo_ = self.pull(); hi_ = self.pull()
-            self.pc = ((hi_ << 8) | lo_) & 0xFFFF
-            c=6
-        elif op == 0x60:
-            # RTS
-            lo_ = self.pull(); hi_ = self.pull()
-            self.pc = (((hi_ << 8) | lo_) + 1) & 0xFFFF
-            c=6
-        elif op == 0x0A:
-            # ASL A
-            old = self.a
-            self.set_flag(self.C, (old & 0x80) != 0)
-            self.a = clamp8(old << 1)
-            self.update_zn(self.a)
-            c=2
-        elif op == 0x4A:
-            # LSR A
-            old = self.a
-            self.set_flag(self.C, (old & 1) != 0)
-            self.a = (old >> 1) & 0xFF
-            self.update_zn(self.a)
-            c=2
-        elif op == 0x2A:
-            # ROL A
-            old = self.a
-            carry = self.get_flag(self.C)
-            self.set_flag(self.C, (old & 0x80) != 0)
-            self.a = ((old << 1) | carry) & 0xFF
-            self.update_zn(self.a); c=2
-        elif op == 0x6A:
-            # ROR A
-            old = self.a
-            carry = self.get_flag(self.C)
-            self.set_flag(self.C, (old & 1) != 0)
-            self.a = ((carry << 7) | (old >> 1)) & 0xFF
-            self.update_zn(self.a); c=2
-
-        # --- Jumps / Branches ---
-        elif op == 0x4C:  # JMP abs
-            self.pc = self.read_word(self.pc); c=3
-        elif op == 0x6C:  # JMP ind
-            self.pc = self.fetch_ind(); c=5
-        elif op == 0x20:  # JSR abs
-            addr = self.read_word(self.pc); self.pc = (self.pc + 2) & 0xFFFF
-            temp = (self.pc - 1) & 0xFFFF
-            self.push(hi(temp)); self.push(lo(temp))
-            self.pc = addr; c=6
-        elif op in (0x10,0x30,0x50,0x70,0x90,0xB0,0xF0,0xD0):
-            # BPL,BMI,BVC,BVS,BCC,BCS,BEQ,BNE
-            offset = self.read(self.pc); self.pc = (self.pc + 1) & 0xFFFF
-            if offset & 0x80: offset -= 0x100
-            cond = False
-            if op == 0x10: cond = (self.get_flag(self.N)==0)
-            elif op == 0x30: cond = (self.get_flag(self.N)==1)
-            elif op == 0x50: cond = (self.get_flag(self.V)==0)
-            elif op == 0x70: cond = (self.get_flag(self.V)==1)
-            elif op == 0x90: cond = (self.get_flag(self.C)==0)
-            elif op == 0xB0: cond = (self.get_flag(self.C)==1)
-            elif op == 0xF0: cond = (self.get_flag(self.Z)==1)
-            elif op == 0xD0: cond = (self.get_flag(self.Z)==0)
-            c = 2
-            if cond:
-                old_pc = self.pc
-                self.pc = (self.pc + offset) & 0xFFFF
-                c += 1
-                if (old_pc & 0xFF00) != (self.pc & 0xFF00): c += 1
-
-        # --- Load/Store ---
-        elif op in (0xA9,0xA5,0xB5,0xAD,0xBD,0xB9,0xA1,0xB1):  # LDA
-            if   op == 0xA9: v,_,_= self.fetch_imm(); c=2
-            elif op == 0xA5: v,_,_= self.fetch_zp();  c=3
-            elif op == 0xB5: v,_,_= self.fetch_zpx(); c=4
-            elif op == 0xAD: v,_,_= self.fetch_abs(); c=4
-            elif op == 0xBD: v,_,x= self.fetch_absx(); c=4 + (1 if x else 0)
-            elif op == 0xB9: v,_,x= self.fetch_absy(); c=4 + (1 if x else 0)
-            elif op == 0xA1: v,_,_= self.fetch_indx(); c=6
-            elif op == 0xB1: v,_,x= self.fetch_indy(); c=5 + (1 if x else 0)
-            self.a = v & 0xFF; self.update_zn(self.a)
-        elif op in (0xA2,0xA6,0xB6,0xAE,0xBE):  # LDX
-            if   op == 0xA2: v,_,_= self.fetch_imm(); c=2
-            elif op == 0xA6: v,_,_= self.fetch_zp();  c=3
-            elif op == 0xB6: v,_,_= self.fetch_zpy(); c=4
-            elif op == 0xAE: v,_,_= self.fetch_abs(); c=4
-            elif op == 0xBE: v,_,x= self.fetch_absy(); c=4 + (1 if x else 0)
-            self.x = v & 0xFF; self.update_zn(self.x)
-        elif op in (0xA0,0xA4,0xB4,0xAC,0xBC):  # LDY
-            if   op == 0xA0: v,_,_= self.fetch_imm(); c=2
-            elif op == 0xA4: v,_,_= self.fetch_zp();  c=3
-            elif op == 0xB4: v,_,_= self.fetch_zpx(); c=4
-            elif op == 0xAC: v,_,_= self.fetch_abs(); c=4
-            elif op == 0xBC: v,_,x= self.fetch_absx(); c=4 + (1 if x else 0)
-            self.y = v & 0xFF; self.update_zn(self.y)
-        elif op in (0x85,0x95,0x8D,0x9D,0x99,0x81,0x91):  # STA
-            if   op == 0x85: _,a,_= self.fetch_zp();  c=3
-            elif op == 0x95: _,a,_= self.fetch_zpx(); c=4
-            elif op == 0x8D: _,a,_= self.fetch_abs(); c=4
-            elif op == 0x9D: _,a,_= self.fetch_absx(); c=5
-            elif op == 0x99: _,a,_= self.fetch_absy(); c=5
-            elif op == 0x81: _,a,_= self.fetch_indx(); c=6
-            elif op == 0x91: _,a,_= self.fetch_indy(); c=6
-            self.write(a, self.a)
-        elif op in (0x86,0x96,0x8E):  # STX
-            if   op == 0x86: _,a,_= self.fetch_zp();  c=3
-            elif op == 0x96: _,a,_= self.fetch_zpy(); c=4
-            elif op == 0x8E: _,a,_= self.fetch_abs(); c=4
-            self.write(a, self.x)
-        elif op in (0x84,0x94,0x8C):  # STY
-            if   op == 0x84: _,a,_= self.fetch_zp();  c=3
-            elif op == 0x94: _,a,_= self.fetch_zpx(); c=4
-            elif op == 0x8C: _,a,_= self.fetch_abs(); c=4
-            self.write(a, self.y)
-
-        # --- Arithmetic / Logic ---
-        elif op in (0x69,0x65,0x75,0x6D,0x7D,0x79,0x61,0x71):  # ADC
-            if   op == 0x69: v,_,_= self.fetch_imm(); c=2
-            elif op == 0x65: v,_,_= self.fetch_zp();  c=3
-            elif op == 0x75: v,_,_= self.fetch_zpx(); c=4
-            elif op == 0x6D: v,_,_= self.fetch_abs(); c=4
-            elif op == 0x7D: v,_,x= self.fetch_absx(); c=4 + (1 if x else 0)
-            elif op == 0x79: v,_,x= self.fetch_absy(); c=4 + (1 if x else 0)
-            elif op == 0x61: v,_,_= self.fetch_indx(); c=6
-            elif op == 0x71: v,_,x= self.fetch_indy(); c=5 + (1 if x else 0)
-            carry = self.get_flag(self.C)
-            res = self.a + v + carry
-            self.set_flag(self.C, res > 0xFF)
-            self.set_flag(self.V, (~(self.a ^ v) & (self.a ^ res) & 0x80) != 0)
-            self.a = res & 0xFF; self.update_zn(self.a)
-        elif op in (0xE9,0xE5,0xF5,0xED,0xFD,0xF9,0xE1,0xF1):  # SBC
-            if   op == 0xE9: v,_,_= self.fetch_imm(); c=2
-            elif op == 0xE5: v,_,_= self.fetch_zp();  c=3
-            elif op == 0xF5: v,_,_= self.fetch_zpx(); c=4
-            elif op == 0xED: v,_,_= self.fetch_abs(); c=4
-            elif op == 0xFD: v,_,x= self.fetch_absx(); c=4 + (1 if x else 0)
-            elif op == 0xF9: v,_,x= self.fetch_absy(); c=4 + (1 if x else 0)
-            elif op == 0xE1: v,_,_= self.fetch_indx(); c=6
-            elif op == 0xF1: v,_,x= self.fetch_indy(); c=5 + (1 if x else 0)
-            carry = self.get_flag(self.C)
-            v ^= 0xFF
-            res = self.a + v + carry
-            self.set_flag(self.C, res > 0xFF)
-            self.set_flag(self.V, (~(self.a ^ v) & (self.a ^ res) & 0x80) != 0)
-            self.a = res & 0xFF; self.update_zn(self.a)
-        elif op in (0x29,0x25,0x35,0x2D,0x3D,0x39,0x21,0x31):  # AND
-            if   op == 0x29: v,_,_= self.fetch_imm(); c=2
-            elif op == 0x25: v,_,_= self.fetch_zp();  c=3
-            elif op == 0x35: v,_,_= self.fetch_zpx(); c=4
-            elif op == 0x2D: v,_,_= self.fetch_abs(); c=4
-            elif op == 0x3D: v,_,x= self.fetch_absx(); c=4 + (1 if x else 0)
-            elif op == 0x39: v,_,x= self.fetch_absy(); c=4 + (1 if x else 0)
-            elif op == 0x21: v,_,_= self.fetch_indx(); c=6
-            elif op == 0x31: v,_,x= self.fetch_indy(); c=5 + (1 if x else 0)
-            self.a = self.a & v; self.update_zn(self.a)
-        elif op in (0x09,0x05,0x15,0x0D,0x1D,0x19,0x01,0x11):  # ORA
-            if   op == 0x09: v,_,_= self.fetch_imm(); c=2
-            elif op == 0x05: v,_,_= self.fetch_zp();  c=3
-            elif op == 0x15: v,_,_= self.fetch_zpx(); c=4
-            elif op == 0x0D: v,_,_= self.fetch_abs(); c=4
-            elif op == 0x1D: v,_,x= self.fetch_absx(); c=4 + (1 if x else 0)
-            elif op == 0x19: v,_,x= self.fetch_absy(); c=4 + (1 if x else 0)
-            elif op == 0x01: v,_,_= self.fetch_indx(); c=6
-            elif op == 0x11: v,_,x= self.fetch_indy(); c=5 + (1 if x else 0)
-            self.a = self.a | v; self.update_zn(self.a)
-        elif op in (0x49,0x45,0x55,0x4D,0x5D,0x59,0x41,0x51):  # EOR
-            if   op == 0x49: v,_,_= self.fetch_imm(); c=2
-            elif op == 0x45: v,_,_= self.fetch_zp();  c=3
-            elif op == 0x55: v,_,_= self.fetch_zpx(); c=4
-            elif op == 0x4D: v,_,_= self.fetch_abs(); c=4
-            elif op == 0x5D: v,_,x= self.fetch_absx(); c=4 + (1 if x else 0)
-            elif op == 0x59: v,_,x= self.fetch_absy(); c=4 + (1 if x else 0)
-            elif op == 0x41: v,_,_= self.fetch_indx(); c=6
-            elif op == 0x51: v,_,x= self.fetch_indy(); c=5 + (1 if x else 0)
-            self.a = self.a ^ v; self.update_zn(self.a)
-        elif op in (0xC9,0xC5,0xD5,0xCD,0xDD,0xD9,0xC1,0xD1):  # CMP
-            if   op == 0xC9: v,_,_= self.fetch_imm(); c=2
-            elif op == 0xC5: v,_,_= self.fetch_zp();  c=3
-            elif op == 0xD5: v,_,_= self.fetch_zpx(); c=4
-            elif op == 0xCD: v,_,_= self.fetch_abs(); c=4
-            elif op == 0xDD: v,_,x= self.fetch_absx(); c=4 + (1 if x else 0)
-            elif op == 0xD9: v,_,x= self.fetch_absy(); c=4 + (1 if x else 0)
-            elif op == 0xC1: v,_,_= self.fetch_indx(); c=6
-            elif op == 0xD1: v,_,x= self.fetch_indy(); c=5 + (1 if x else 0)
-            t = (self.a - v) & 0x1FF
-            self.set_flag(self.C, self.a >= v); self.set_flag(self.Z, (t & 0xFF)==0); self.set_flag(self.N, (t & 0x80)!=0)
-        elif op in (0xE0,0xE4,0xEC):  # CPX
-            if   op == 0xE0: v,_,_= self.fetch_imm(); c=2
-            elif op == 0xE4: v,_,_= self.fetch_zp();  c=3
-            elif op == 0xEC: v,_,_= self.fetch_abs(); c=4
-            t = (self.x - v) & 0x1FF
-            self.set_flag(self.C, self.x >= v); self.set_flag(self.Z, (t & 0xFF)==0); self.set_flag(self.N, (t & 0x80)!=0)
-        elif op in (0xC0,0xC4,0xCC):  # CPY
-            if   op == 0xC0: v,_,_= self.fetch_imm(); c=2
-            elif op == 0xC4: v,_,_= self.fetch_zp();  c=3
-            elif op == 0xCC: v,_,_= self.fetch_abs(); c=4
-            t = (self.y - v) & 0x1FF
-            self.set_flag(self.C, self.y >= v); self.set_flag(self.Z, (t & 0xFF)==0); self.set_flag(self.N, (t & 0x80)!=0)
-        elif op in (0x24,0x2C):  # BIT zp/abs
-            if op == 0x24: v,_,_= self.fetch_zp(); c=3
-            else:          v,_,_= self.fetch_abs(); c=4
-            self.set_flag(self.Z, (self.a & v)==0)
-            self.set_flag(self.V, (v & 0x40)!=0)
-            self.set_flag(self.N, (v & 0x80)!=0)
-
-        # --- INC/DEC & Shifts (memory) ---
-        elif op in (0xE6,0xF6,0xEE,0xFE):  # INC
-            if   op == 0xE6: v,a,_= self.fetch_zp();  c=5
-            elif op == 0xF6: v,a,_= self.fetch_zpx(); c=6
-            elif op == 0xEE: v,a,_= self.fetch_abs(); c=6
-            elif op == 0xFE: v,a,_= self.fetch_absx(); c=7
-            v = (v + 1) & 0xFF; self.write(a, v); self.update_zn(v)
-        elif op in (0xC6,0xD6,0xCE,0xDE):  # DEC
-            if   op == 0xC6: v,a,_= self.fetch_zp();  c=5
-            elif op == 0xD6: v,a,_= self.fetch_zpx(); c=6
-            elif op == 0xCE: v,a,_= self.fetch_abs(); c=6
-            elif op == 0xDE: v,a,_= self.fetch_absx(); c=7
-            v = (v - 1) & 0xFF; self.write(a, v); self.update_zn(v)
-        elif op in (0x06,0x16,0x0E,0x1E):  # ASL mem
-            if   op == 0x06: v,a,_= self.fetch_zp();  c=5
-            elif op == 0x16: v,a,_= self.fetch_zpx(); c=6
-            elif op == 0x0E: v,a,_= self.fetch_abs(); c=6
-            elif op == 0x1E: v,a,_= self.fetch_absx(); c=7
-            self.set_flag(self.C, (v & 0x80)!=0); v=(v<<1)&0xFF; self.write(a,v); self.update_zn(v)
-        elif op in (0x46,0x56,0x4E,0x5E):  # LSR mem
-            if   op == 0x46: v,a,_= self.fetch_zp();  c=5
-            elif op == 0x56: v,a,_= self.fetch_zpx(); c=6
-            elif op == 0x4E: v,a,_= self.fetch_abs(); c=6
-            elif op == 0x5E: v,a,_= self.fetch_absx(); c=7
-            self.set_flag(self.C, (v & 1)!=0); v=(v>>1)&0xFF; self.write(a,v); self.update_zn(v)
-        elif op in (0x26,0x36,0x2E,0x3E):  # ROL mem
-            if   op == 0x26: v,a,_= self.fetch_zp();  c=5
-            elif op == 0x36: v,a,_= self.fetch_zpx(); c=6
-            elif op == 0x2E: v,a,_= self.fetch_abs(); c=6
-            elif op == 0x3E: v,a,_= self.fetch_absx(); c=7
-            cary=self.get_flag(self.C); self.set_flag(self.C,(v&0x80)!=0); v=((v<<1)|cary)&0xFF; self.write(a,v); self.update_zn(v)
-        elif op in (0x66,0x76,0x6E,0x7E):  # ROR mem
-            if   op == 0x66: v,a,_= self.fetch_zp();  c=5
-            elif op == 0x76: v,a,_= self.fetch_zpx(); c=6
-            elif op == 0x6E: v,a,_= self.fetch_abs(); c=6
-            elif op == 0x7E: v,a,_= self.fetch_absx(); c=7
-            cary=self.get_flag(self.C); self.set_flag(self.C,(v&1)!=0); v=((cary<<7)|(v>>1))&0xFF; self.write(a,v); self.update_zn(v)
-
-        else:
-            # Fallback NOP for unimplemented/illegal opcodes (keeps many simple ROMs running)
-            c = 2
-
+        pc = self.pc
+        op = self.read(pc); self.pc = (pc + 1) & 0xFFFF
+        c = STEP_FNS[op](self)
         self.cycles += c
         return c
 
+    def run_until(self, target: int) -> int:
+        # Execute until cpu.cycles reaches `target` without stepping the PPU/APU; the
+        # caller syncs them once for the whole run. Code in PRG ROM runs a compiled block
+        # at a time when the block is guaranteed to end by `target`; anything else is
+        # fetched and dispatched to STEP_FNS right here, with step() left to handle DMA
+        # stalls and interrupts. Returns cycles run.
+        step = self.step
+        read = self.read
+        fns = STEP_FNS
+        mapper = self.nes.mapper
+        cache = self.block_cache
+        start = self.cycles
+        while self.cycles < target:
+            if self.stall or self.nmi_pending or self.irq_pending:
+                step()
+                continue
+            pc = self.pc
+            if pc >= 0x8000:
+                key = (mapper.prg_bank_tag << 16) | pc
+                blk = cache.get(key)
+                if blk is None:
+                    blk = cache[key] = self._compile_block(pc)
+                if self.cycles + blk.max_cycles <= target:
+                    blk.fn(self)
+                    continue
+            op = read(pc); self.pc = (pc + 1) & 0xFFFF
+            self.cycles += fns[op](self)
+        return self.cycles - start
+
+    def step_many(self, budget: int) -> int:
+        # Run instructions until at least `budget` cycles have elapsed. Returns the cycles
+        # actually executed.
+        # The CPU can only observe the PPU through vblank (the $2002 flag and NMI), which
+        # changes only at the edges dots_to_event() reports. Up to the last instruction
+        # that cannot reach the next edge, run_until executes without touching the PPU,
+        # which is then advanced in one step; instructions near the edge and the budget
+        # are stepped in lockstep, so timing is identical to stepping one at a time.
+        step = self.step
+        run_until = self.run_until
+        ppu = self.nes.ppu
+        ppu_step = ppu.step
+        apu_step = self.nes.apu.step
+        done = 0
+        while done < budget:
+            run = min(budget - done, (ppu.dots_to_event() - 1) // 3 - (MAX_STEP_CYCLES - 1))
+            if run > 0:
+                cyc = run_until(self.cycles + run)
+            else:
+                cyc = step()
+            ppu_step(cyc)
+            apu_step()
+            done += cyc
+        return done
+
+    def _compile_block(self, start: int) -> Block:
+        # Decode forward from `start` and emit straight-line Python with operands folded
+        # to constants and A/X/Y/P held in locals. Common instructions are inlined from
+        # _INLINE; the rest call the interpreter's STEP_FNS entry, with the registers
+        # synced around the call. A block ends at control flow, or after a store that
+        # might reach MMIO or the mapper.
+        read = self.read
+        ns = {'read': read, 'ram': self.nes.ram, 'NZ': _NZ}
+        src = ['def run(cpu):', '    c = 0', '    flushed = 0',
+               '    A = cpu.a; X = cpu.x; Y = cpu.y; P = cpu.flags']
+        dirty = set()
+
+        def sync():
+            # Hand the live registers to a STEP_FNS call and pick up whatever it changed
+            if dirty:
+                src.append('    ' + '; '.join(f'cpu.{_REG_ATTR[r]} = {r}' for r in sorted(dirty)))
+                dirty.clear()
+            return '    A = cpu.a; X = cpu.x; Y = cpu.y; P = cpu.flags'
+
+        pc = start
+        static = slack = count = 0
+        for _ in range(MAX_BLOCK_INSNS):
+            op = read(pc)
+            name = OPCODE_NAME[op]
+            mode = ADDR_MODES[OPCODE_MODE[op]]
+            nxt = pc + _MODE_SIZE[mode]
+            if nxt > 0x10000:
+                break
+            k = read(pc + 1) if nxt - pc == 2 else self.read_word(pc + 1) if nxt - pc == 3 else 0
+            nxt &= 0xFFFF
+            count += 1
+            pre = []      # operand setup lines, emitted only when the body is inlined
+            extra = 0     # worst-case page-cross cycles those lines may add
+            v = m = None  # operand value expression / RAM cell expression
+            if mode == 'acc':
+                m = 'A'
+            elif mode == 'imm':
+                v = str(k)
+            elif mode == 'zp':
+                m = f'ram[{k}]'
+            elif mode == 'abs':
+                if k < 0x2000:
+                    m = f'ram[{k & RAM_MASK}]'
+                else:
+                    v = f'read({k})'
+            elif mode in ('zpx', 'zpy'):
+                pre.append(f'    a = ({k} + {mode[-1].upper()}) & 0xFF')
+                m = 'ram[a]'
+            elif mode in ('absx', 'absy'):
+                pre.append(f'    a = ({k} + {mode[-1].upper()}) & 0xFFFF')
+                if OPCODE_PAGECROSS[op]:
+                    pre.append(f'    if (a ^ {k}) & 0xFF00: c += 1')
+                    extra = 1
+                if k + 0xFF < 0x2000:
+                    m = f'ram[a & {RAM_MASK}]'
+                else:
+                    v = 'read(a)'
+            elif mode == 'indx':
+                pre.append(f'    z = ({k} + X) & 0xFF')
+                pre.append('    a = (ram[(z + 1) & 0xFF] << 8) | ram[z]')
+                v = 'read(a)'
+            elif mode == 'indy':
+                pre.append(f'    b = (ram[{(k + 1) & 0xFF}] << 8) | ram[{k}]')
+                pre.append('    a = (b + Y) & 0xFFFF')
+                if OPCODE_PAGECROSS[op]:
+                    pre.append('    if (a ^ b) & 0xFF00: c += 1')
+                    extra = 1
+                v = 'read(a)'
+            if m is not None and v is None:
+                v = m
+
+            if name in _BRANCHES:
+                target = (nxt + (k - 0x100 if k & 0x80 else k)) & 0xFFFF
+                mask, expect = _BR[op]
+                src.append(f'    if {"" if expect else "not "}P & 0x{mask:02X}:')
+                src.append(f'        cpu.pc = {target}')
+                src.append(f'        c += {2 if (nxt ^ target) & 0xFF00 else 1}')
+                src.append('    else:')
+                src.append(f'        cpu.pc = {nxt}')
+                slack += 2
+                static += OPCODE_CYCLES[op]
+                pc = None
+                break
+
+            if name == 'JMP' and mode == 'abs':
+                src.append(f'    cpu.pc = {k}')
+                static += OPCODE_CYCLES[op]
+                pc = None
+                break
+            if name == 'JSR':
+                ret = (nxt - 1) & 0xFFFF
+                src.append('    s = cpu.sp')
+                src.append(f'    ram[{STACK_BASE} + s] = {ret >> 8}; ram[{STACK_BASE} + ((s - 1) & 0xFF)] = {ret & 0xFF}')
+                src.append('    cpu.sp = (s - 2) & 0xFF')
+                src.append(f'    cpu.pc = {k}')
+                static += OPCODE_CYCLES[op]
+                pc = None
+                break
+
+            inline = _INLINE.get(name)
+            if inline is not None and (m is None if name in _MEM_WRITERS else v is None and mode != 'imp'):
+                inline = None  # store/RMW that may leave RAM goes through the bus
+            if inline is not None:
+                writes, lines = inline
+                if name in ('LDA', 'LDX', 'LDY') and mode == 'imm':
+                    r = name[-1]
+                    lines = (f'{r} = {k}', f'P = (P & 0x7D) | {_NZ[k]}')
+                dirty.update(writes)
+                if m == 'A':
+                    dirty.add('A')
+                src.extend(pre)
+                src.extend('    ' + ln.format(v=v, m=m) for ln in lines)
+                static += OPCODE_CYCLES[op]
+                slack += extra
+                if name in ('RTS', 'RTI'):
+                    pc = None
+                    break
+                pc = nxt
+                continue
+
+            # Anything else (BRK, JMP indirect, stores that may reach MMIO/mapper) runs
+            # the interpreter's function; its cycles land in c, so count them as slack
+            fn = 'S%02X' % op
+            ns[fn] = STEP_FNS[op]
+            unsafe_write = name in _MEM_WRITERS
+            reload = sync()
+            if unsafe_write:
+                # Bring cpu.cycles up to date first (OAM DMA stall parity depends on it)
+                src.append(f'    flushed = c + {static}')
+                src.append('    cpu.cycles += flushed')
+            src.append(f'    cpu.pc = {(pc + 1) & 0xFFFF}')
+            src.append(f'    c += {fn}(cpu)')
+            src.append(reload)
+            slack += OPCODE_CYCLES[op] + OPCODE_PAGECROSS[op]
+            pc = None if name in _BLOCK_ENDERS else nxt
+            if unsafe_write or pc is None:
+                break
+
+        if count == 0:
+            # Nothing compilable here (operand would wrap past $FFFF); never taken
+            return Block(None, start, 0, 1 << 30)
+        if dirty:
+            src.append('    ' + '; '.join(f'cpu.{_REG_ATTR[r]} = {r}' for r in sorted(dirty)))
+        if pc is not None:
+            src.append(f'    cpu.pc = {pc}')
+        src.append(f'    c += {static}')
+        src.append('    cpu.cycles += c - flushed')
+        src.append('    return c')
+        exec(compile('\n'.join(src), f'<block ${start:04X}>', 'exec'), ns)
+        return Block(ns['run'], pc if pc is not None else -1, static, static + slack)
+
 # ────────────────────────────────────────────────────────────────────────────────────
 # PPU
 # ────────────────────────────────────────────────────────────────────────────────────
 
+# Palette RAM index (addr & 0x1F) -> stored entry; sprite backdrops $3F10/14/18/1C mirror $3F00/04/08/0C
+_PAL_MIRROR = bytes(i & 0x0F if i & 0x13 == 0x10 else i for i in range(32))
+
 class PPU:
     def __init__(self, nes: 'NESBackend'):
         self.nes = nes
         self.palette_ram = bytearray(0x20)  # 0x3F00-0x3F1F
         self.oam = bytearray(0x100)         # 256 bytes
         self.vram = bytearray(0x800)        # 2KB nametable RAM (mirroring applied)
-        self.framebuffer = np.zeros((240,256,3), dtype=np.uint8)
+        # Zero-copy np.uint8 views of the same memory for vectorized renderer access;
+        # scalar register/CPU traffic stays on the bytearrays, which index faster.
+        self.palette_np = np.frombuffer(self.palette_ram, dtype=np.uint8)
+        self.oam_np = np.frombuffer(self.oam, dtype=np.uint8)
+        self._oam2d = self.oam_np.reshape(64, 4)  # y, tile, attr, x per sprite
+        self.vram_np = np.frombuffer(self.vram, dtype=np.uint8)
+        # 6-bit NES palette indices, black (0x0F) until the first frame renders
+        self.framebuffer = np.full((240,256), 0x0F, dtype=np.uint8)
+        self._fb_back = np.full_like(self.framebuffer, 0x0F)  # next frame renders here, then swaps
+        self._colors = self.palette_np & 0x3F  # palette RAM as NES color indices; see ppu_write
+        self._bg_opaque = np.zeros((240, 256), dtype=bool)  # BG pattern pixel != 0, per frame
+        self._attr_lut = {}  # vram nametable offset -> (30, 32) palette-select bits per tile
 
         # PPU registers/state
         self.ppuctrl = 0
@@ -686,11 +897,12 @@ class PPU:
         self.t = 0               # temporary VRAM address (15-bit)
         self.x = 0               # fine X scroll (3-bit)
         self.w = 0               # first/second write toggle
+        self._read_buffer = 0    # PPUDATA read buffer for <0x3F00
         self.scanline = 0
         self.cycle = 0
 
         # Mirroring mode: 'H' or 'V'
-        self.mirroring = 'H'
+        self.set_mirroring('H')
 
         # CHR access via mapper
         self.bg_pattern_table = 0  # 0 or 0x1000 (bit 4 of PPUCTRL)
@@ -698,6 +910,13 @@ class PPU:
 
     def set_mirroring(self, mode: str):
         self.mirroring = mode
+        # vram offset of each of the four logical nametables
+        if mode == 'V':
+            # NT0,NT2 are unique; NT1 mirrors NT0; NT3 mirrors NT2
+            self._nt_base = (0x000, 0x000, 0x400, 0x400)
+        else:
+            # Horizontal: NT0,NT1 unique; NT2 mirrors NT0; NT3 mirrors NT1
+            self._nt_base = (0x000, 0x400, 0x000, 0x400)
 
     def load_chr(self, chr_data: bytes):
         # handled by mapper; no local copy required
@@ -717,7 +936,7 @@ class PPU:
             # buffered read for <0x3F00; direct for palette
             if (self.v & 0x3FFF) < 0x3F00:
                 val = self.ppu_read(self.v)
-                ret = getattr(self, '_read_buffer', 0)
+                ret = self._read_buffer
                 self._read_buffer = val
                 self.v = (self.v + (32 if (self.ppuctrl & 0x04) else 1)) & 0x7FFF
                 return ret
@@ -767,18 +986,7 @@ class PPU:
     # --- VRAM access (with mirroring) ---
     def _mirror_nt_addr(self, addr: int) -> int:
         # Map 0x2000-0x2FFF to 2KB VRAM using mirroring
-        a = (addr - 0x2000) & 0x0FFF
-        table = a // 0x400  # 0..3
-        offset = a % 0x400
-        if self.mirroring == 'V':
-            # NT0,NT2 are unique; NT1 mirrors NT0; NT3 mirrors NT2
-            if table in (0,1): base = 0x000
-            else: base = 0x400
-        else:
-            # Horizontal: NT0,NT1 unique; NT2 mirrors NT0; NT3 mirrors NT1
-            if table in (0,2): base = 0x000
-            else: base = 0x400
-        return (base + offset) & 0x7FF
+        return self._nt_base[(addr >> 10) & 3] | (addr & 0x3FF)
 
     def ppu_read(self, addr: int) -> int:
         a = addr & 0x3FFF
@@ -787,9 +995,7 @@ class PPU:
         elif a < 0x3F00:
             return self.vram[self._mirror_nt_addr(a)]
         elif a < 0x4000:
-            idx = a & 0x1F
-            if idx in (0x10,0x14,0x18,0x1C): idx -= 0x10  # mirrors
-            return self.palette_ram[idx]
+            return self.palette_ram[_PAL_MIRROR[a & 0x1F]]
         return 0
 
     def ppu_write(self, addr: int, val: int):
@@ -798,18 +1004,45 @@ class PPU:
         if a < 0x2000:
             self.nes.mapper.ppu_write(a, v)
         elif a < 0x3F00:
-            self.vram[self._mirror_nt_addr(a)] = v
+            i = self._mirror_nt_addr(a)
+            self.vram[i] = v
+            if i & 0x3FF >= 0x3C0:
+                self._attr_lut.pop(i & 0x400, None)  # attribute table changed
         elif a < 0x4000:
-            idx = a & 0x1F
-            if idx in (0x10,0x14,0x18,0x1C): idx -= 0x10
+            idx = _PAL_MIRROR[a & 0x1F]
             self.palette_ram[idx] = v
+            self._colors[idx] = v & 0x3F
+
+    def _attr_grid(self, nt: int) -> np.ndarray:
+        # Attribute table of the nametable at vram offset `nt` expanded to one 2-bit
+        # palette select per tile; rebuilt only after its attribute bytes are written.
+        # The quadrant shift within each byte is qy*4 + qx*2.
+        grid = self._attr_lut.get(nt)
+        if grid is None:
+            ty = np.arange(30)[:, None]
+            tx = np.arange(32)
+            at = self.vram_np[nt + 0x3C0 + (ty >> 2) * 8 + (tx >> 2)]
+            grid = self._attr_lut[nt] = (at >> (((ty & 2) << 1) | (tx & 2))) & 0x03
+        return grid
 
     def do_oam_dma(self, page: int):
         start = (page & 0xFF) << 8
+        if start < 0x2000:
+            # RAM page: no side effects, so copy it in two slices (OAM writes wrap at oamaddr)
+            src = memoryview(self.nes.ram)[start & RAM_MASK:(start & RAM_MASK) + 256]
+            n = 256 - self.oamaddr
+            self.oam[self.oamaddr:] = src[:n]
+            self.oam[:256 - n] = src[n:]
+            return
         for i in range(256):
             self.oam[(self.oamaddr + i) & 0xFF] = self.nes.cpu.read(start + i)
 
     # --- Timing (very simplified) ---
+    def dots_to_event(self) -> int:
+        # PPU dots until the next vblank edge (scanline 241 start / end of frame)
+        target = 241 if self.scanline < 241 else 262
+        return (target - self.scanline) * 341 - self.cycle
+
     def step(self, cpu_cycles: int):
         # Advance PPU ~3x CPU
         self.cycle += (cpu_cycles * 3)
@@ -838,87 +1071,62 @@ class PPU:
         scroll_y = (((self.v & 0x03E0) >> 5) << 3) | ((self.v & 0x7000) >> 12)
 
         # --- Render Background ---
-        fb = self.framebuffer
-        fb[:, :] = NES_PALETTE[self.palette_ram[0] & 0x3F]  # universal bg
-
-        name_table_base = 0x2000 | (self.v & 0x0C00)
-        attr_base = name_table_base + 0x03C0
-        pattern_base = self.bg_pattern_table
-
-        # Draw 32x30 tiles
-        for ty in range(30):   # tile rows
-            for tx in range(32):  # tile columns
-                nt_x = (tx + ((scroll_x // 8) % 32)) % 32
-                nt_y = (ty + ((scroll_y // 8) % 30)) % 30
-                nt_addr = name_table_base + nt_y * 32 + nt_x
-                tile_index = self.ppu_read(nt_addr)
-
-                # Attribute: 4x4 tile attribute table; select upper bits of palette
-                at_x = nt_x // 4
-                at_y = nt_y // 4
-                at_addr = attr_base + at_y * 8 + at_x
-                at = self.ppu_read(at_addr)
-                # determine quadrant
-                qx = (nt_x % 4) // 2
-                qy = (nt_y % 4) // 2
-                shift = (qy * 2 + qx) * 2
-                palette_hi = (at >> shift) & 0x03
-
-                # Fetch tile pattern rows
-                tile_base = pattern_base + tile_index * 16
-                # Render 8x8 pixels
-                for row in range(8):
-                    lo_ = self.nes.mapper.ppu_read(tile_base + row)
-                    hi_ = self.nes.mapper.ppu_read(tile_base + row + 8)
-                    py = (ty * 8 + row) - (scroll_y % 8)
-                    if py < 0 or py >= 240: continue
-                    # Compose row pixels
-                    for col in range(8):
-                        bit = 7 - col
-                        p = ((lo_ >> bit) & 1) | (((hi_ >> bit) & 1) << 1)
-                        if p == 0:  # background color
-                            continue
-                        px = (tx * 8 + col) - (scroll_x % 8)
-                        if px < 0 or px >= 256: continue
-                        pal_idx = 0x3F00 + (palette_hi << 2) + p
-                        color = NES_PALETTE[self.ppu_read(pal_idx) & 0x3F]
-                        fb[py, px] = color
+        fb = self._fb_back
+        colors = self._colors  # palette RAM resolved to NES color indices
+        fb[:, :] = colors[0]  # universal bg
+
+        chr_tiles = self.nes.mapper.chr_tiles()
+        nt_sel = (self.v >> 10) & 3
+        tile_base = self.bg_pattern_table >> 4
+        fine_x = scroll_x & 7
+        fine_y = scroll_y & 7
+
+        # Tile grid one tile wider and taller than the screen, so fine scroll is just a
+        # slice; coarse scroll past a nametable edge continues into the neighbouring one
+        cx = np.arange(33) + (scroll_x >> 3)
+        cy = np.arange(31) + ((scroll_y >> 3) % 30)
+        sel = nt_sel ^ (((cy >= 30) << 1)[:, None] | (cx >= 32))  # (31, 33) logical nametable
+        nt = np.array(self._nt_base)[sel]
+        ty = (cy % 30)[:, None]
+        tx = cx & 31
+        tiles = tile_base + self.vram_np[nt + ty * 32 + tx].astype(np.intp)
+        palette_hi = np.stack([self._attr_grid(0x000), self._attr_grid(0x400)])[nt >> 10, ty, tx]
+
+        # One gather decodes the whole canvas: (31, 33, 8, 8) -> (248, 264) pixel rows
+        pix = chr_tiles[tiles].transpose(0, 2, 1, 3).reshape(248, 264)
+        idx = (palette_hi.repeat(8, axis=0).repeat(8, axis=1) << 2) | pix
+        view = (slice(fine_y, fine_y + 240), slice(fine_x, fine_x + 256))
+
+        bg_opaque = self._bg_opaque
+        np.not_equal(pix[view], 0, out=bg_opaque)
+        np.copyto(fb, colors[idx[view]], where=bg_opaque)
 
         # --- Render Sprites (8x8 only) ---
         if spr_enable:
-            for i in range(63, -1, -1):  # draw in reverse order for priority
-                y = self.oam[i*4 + 0] + 1  # sprites are offset by 1
-                tile = self.oam[i*4 + 1]
-                attr = self.oam[i*4 + 2]
-                x = self.oam[i*4 + 3]
-                flip_h = (attr & 0x40) != 0
-                flip_v = (attr & 0x80) != 0
-                pal = (attr & 0x03)
-                priority_back = (attr & 0x20) != 0  # if true, behind background
-                # Only 8x8 sprites in this build
-                pattern_base = self.sprite_pattern_table
-
-                for row in range(8):
-                    sy = (7 - row) if flip_v else row
-                    lo_ = self.nes.mapper.ppu_read(pattern_base + tile * 16 + sy)
-                    hi_ = self.nes.mapper.ppu_read(pattern_base + tile * 16 + sy + 8)
-                    py = y + row
-                    if py < 0 or py >= 240: continue
-                    for col in range(8):
-                        sx = (7 - col) if flip_h else col
-                        bit = 7 - sx
-                        p = ((lo_ >> bit) & 1) | (((hi_ >> bit) & 1) << 1)
-                        if p == 0:
-                            continue
-                        px = x + col
-                        if px < 0 or px >= 256: continue
-                        if priority_back and (fb[py, px] != NES_PALETTE[self.palette_ram[0] & 0x3F]).any():
-                            # behind non-zero background
-                            continue
-                        pal_idx = 0x3F10 + (pal << 2) + p  # sprite palettes
-                        color = NES_PALETTE[self.ppu_read(pal_idx) & 0x3F]
-                        fb[py, px] = color
-
+            # Evaluate OAM as columns: only sprites on screen are decoded and drawn
+            oam = self._oam2d
+            vis = np.flatnonzero(oam[:, 0] < 239)[::-1]  # y+1 < 240; reverse order for priority
+            if len(vis):
+                y, tile, attr, x = oam[vis].T.astype(np.intp)
+                y += 1  # sprites are offset by 1
+                p = chr_tiles[(self.sprite_pattern_table >> 4) + tile].copy()  # (n, 8, 8)
+                flip = (attr & 0x80) != 0
+                p[flip] = p[flip, ::-1]
+                flip = (attr & 0x40) != 0
+                p[flip] = p[flip, :, ::-1]
+                opaque = p != 0
+                # sprite palettes
+                spr_colors = colors[(0x10 | ((attr & 0x03) << 2))[:, None, None] | p]
+                behind = ((attr & 0x20) != 0).tolist()  # if true, behind background
+                for k, (sy, sx) in enumerate(zip(y.tolist(), x.tolist())):
+                    mask = opaque[k, :240 - sy, :256 - sx]
+                    dst = fb[sy:sy + 8, sx:sx + 8]
+                    if behind[k]:
+                        # hidden wherever the background pixel is opaque
+                        mask = mask & ~bg_opaque[sy:sy + 8, sx:sx + 8]
+                    dst[mask] = spr_colors[k, :240 - sy, :256 - sx][mask]
+
+        self._fb_back, self.framebuffer = self.framebuffer, fb
         return fb
 
 # ────────────────────────────────────────────────────────────────────────────────────
@@ -944,6 +1152,8 @@ class NESBackend:
         self.mapper: BaseMapper = None  # type: ignore
         self.ram = bytearray(0x800)
         self.sram = bytearray(0x2000)  # 8KB battery RAM
+        self.ram_np = np.frombuffer(self.ram, dtype=np.uint8)
+        self.sram_np = np.frombuffer(self.sram, dtype=np.uint8)
         self.cycles = 0
         self.frame_count = 0
         self.running = False
@@ -952,6 +1162,7 @@ class NESBackend:
 
         self.input_state = {'A': False, 'B': False, 'SELECT': False, 'START': False, 'UP': False, 'DOWN': False, 'LEFT': False, 'RIGHT': False}
         self.key_map = {'z': 'A','x':'B','Return':'START','Shift_R':'SELECT','Up':'UP','Down':'DOWN','Left':'LEFT','Right':'RIGHT'}
+        self.cpu.map_bus()
 
     def load_rom(self, path: str) -> bool:
         try:
@@ -982,8 +1193,8 @@ class NESBackend:
                 self.mapper = make_mapper(self, mapper_id, prg_data, chr_data, mirroring, chr_is_ram)
                 self.ppu.set_mirroring(mirroring)
 
-                self.ram[:] = b'\x00' * len(self.ram)
-                self.sram[:] = b'\x00' * len(self.sram)
+                self.ram_np.fill(0)
+                self.sram_np.fill(0)
                 self.cpu.reset()
                 self.running = True
 
@@ -998,12 +1209,7 @@ class NESBackend:
         if not self.running:
             return self.ppu.framebuffer
 
-        self.cycles = 0
-        while self.cycles < CPU_CYCLES_PER_FRAME:
-            cyc = self.cpu.step()
-            self.ppu.step(cyc)
-            self.apu.step()
-            self.cycles += cyc
+        self.cycles = self.cpu.step_many(CPU_CYCLES_PER_FRAME)
 
         self.frame_count += 1
         return self.ppu.render_frame()
@@ -1014,7 +1220,7 @@ class NESBackend:
             print(f"Cheat: RAM[0x{addr:04X}] = 0x{value:02X}")
 
     def debug_ram(self, addr: int) -> int:
-        if addr < 0x2000: return self.ram[addr & 0x7FF]
+        if addr < 0x2000: return self.ram[addr & RAM_MASK]
         if 0x6000 <= addr <= 0x7FFF: return self.sram[addr-0x6000]
         return self.cpu.read(addr)
 
@@ -1043,15 +1249,30 @@ class GUI(tk.Tk):
         self.canvas = tk.Canvas(self, width=512, height=480, bg="black", highlightthickness=0)
         self.canvas.pack()
 
-        # Framebuffer image
-        self.image = Image.new('RGB', (256, 240))
-        self.photo_image = ImageTk.PhotoImage(self.image.resize((512, 480), Image.NEAREST))
+        # Framebuffer image; each 2x frame is pasted into this one PhotoImage in place
+        self.photo_image = ImageTk.PhotoImage(Image.new('RGBA', (512, 480)))
         self.image_on_canvas = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo_image)
 
         # Bind keys
         self.bind("<KeyPress>", self.on_key_press)
         self.bind("<KeyRelease>", self.on_key_release)
 
+        # Finished index frames go to a worker that expands and scales them, so the
+        # emulator never waits on the pixel pump; stale frames are dropped, not queued.
+        # The worker fills preallocated 2x buffers that cycle back through _free_q.
+        # Index frames are copied out of the PPU (which keeps rendering into its own
+        # two buffers) into three buffers that cycle back through _idx_free_q.
+        self._frame_q = queue.Queue(maxsize=1)
+        self._image_q = queue.Queue(maxsize=1)
+        self._idx_free_q = queue.Queue()
+        for _ in range(3):  # one being filled, one waiting, one being expanded
+            self._idx_free_q.put(np.empty((240, 256), dtype=np.uint8))
+        self._free_q = queue.Queue()
+        for _ in range(3):  # one being pasted, one waiting, one being filled
+            buf = np.empty((480, 512), dtype=np.uint32)
+            self._free_q.put((buf, Image.frombuffer('RGBA', (512, 480), buf, 'raw', 'RGBA', 0, 1)))
+        threading.Thread(target=self._upload_worker, daemon=True).start()
+
         self.paused = False
         self.after(16, self.update_game)
 
@@ -1130,13 +1351,37 @@ class GUI(tk.Tk):
     def on_key_release(self, event):
         self.nes.set_key_state(event.keysym, False)
 
+    def _upload_worker(self):
+        # Runs off the Tk thread: pixel work only, the PhotoImage is updated in update_game
+        while True:
+            frame = self._frame_q.get()
+            buf, image = self._free_q.get()
+            # 2x nearest-neighbour: every packed RGBA pixel fills a 2x2 block
+            buf.reshape(240, 2, 256, 2)[:] = PALETTE_RGBA.take(frame)[:, None, :, None]
+            self._idx_free_q.put(frame)
+            try:
+                self._free_q.put(self._image_q.get_nowait())  # recycle the unshown frame
+            except queue.Empty:
+                pass
+            self._image_q.put_nowait((buf, image))
+
     def update_game(self):
         if not self.paused:
-            frame = self.nes.step_frame()
-            # Update screen
-            self.image = Image.fromarray(frame, 'RGB')
-            self.photo_image = ImageTk.PhotoImage(self.image.resize((512, 480), Image.NEAREST))
-            self.canvas.itemconfig(self.image_on_canvas, image=self.photo_image)
+            frame = self._idx_free_q.get()
+            np.copyto(frame, self.nes.step_frame())
+            try:
+                self._idx_free_q.put(self._frame_q.get_nowait())  # recycle the unexpanded frame
+            except queue.Empty:
+                pass
+            self._frame_q.put_nowait(frame)
+        # Update screen with the newest frame the worker has ready
+        try:
+            buf, image = self._image_q.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            self.photo_image.paste(image)
+            self._free_q.put((buf, image))
         self.after(16, self.update_game)
 
 # ────────────────────────────────────────────────────────────────────────────────────
@@ -18,11 +18,10 @@ class MirrorType(Enum):
 class Mapper:
     def __init__(self, cartridge):
         self.cartridge = cartridge
+        # NROM-128 mirrors its single 16K bank into $C000
+        self._prg_mask = 0x3FFF if cartridge.prg_banks == 1 else 0x7FFF
     def prg_read(self, addr: int) -> int:
-        addr -= 0x8000
-        if self.cartridge.prg_banks == 1 and addr >= 0x4000:
-            addr -= 0x4000
-        return self.cartridge.prg_rom[addr]
+        return self.cartridge.prg_rom[addr & self._prg_mask]
     def prg_write(self, addr: int, value: int): pass
     def chr_read(self, addr: int) -> int: return self.cartridge.chr_rom[addr]
     def chr_write(self, addr: int, value: int): pass
@@ -46,10 +45,11 @@ class Cartridge:
 
 class Memory:
     def __init__(self, cartridge: Optional[Cartridge] = None):
-        self.ram = [0] * 0x800
-        self.vram = [0] * 0x1000
-        self.palette_ram = [0] * 0x20
-        self.oam = [0] * 0x100
+        # Byte buffers rather than int lists: compact, and np.frombuffer views them without a copy
+        self.ram = bytearray(0x800)
+        self.vram = bytearray(0x1000)
+        self.palette_ram = bytearray(0x20)
+        self.oam = bytearray(0x100)
         self.cartridge = cartridge
         self.mapper = Mapper(cartridge) if cartridge else None
         self.controller = None
@@ -66,18 +66,22 @@ class Memory:
 
     def read(self, addr: int) -> int:
         if 0x0000 <= addr < 0x2000:
-            return self.ram[addr % 0x800]
+            return self.ram[addr & 0x7FF]
         elif 0x8000 <= addr < 0x10000 and self.mapper:
             return self.mapper.prg_read(addr)
         return 0
 
     def write(self, addr: int, value: int):
         if 0x0000 <= addr < 0x2000:
-            self.ram[addr % 0x800] = value
+            self.ram[addr & 0x7FF] = value & 0xFF
         elif 0x8000 <= addr < 0x10000 and self.mapper:
             self.mapper.prg_write(addr, value)
 
 class CPU:
+    # Fixed register set: slot access is cheaper than an instance __dict__
+    __slots__ = ('memory', 'a', 'x', 'y', 'sp', 'pc', 'flags', 'cycles',
+                 'nmi', 'irq', 'opcodes', 'cycle_table')
+
     def __init__(self, memory: Memory):
         self.memory = memory
         self.a = 0; self.x = 0; self.y = 0
@@ -122,7 +126,7 @@ class PPU:
             addr = addr & 0x1F
             if addr in (0x10, 0x14, 0x18, 0x1C):  # ← fixed
                 addr -= 0x10
-            self.memory.palette_ram[addr] = value
+            self.memory.palette_ram[addr] = value & 0xFF
     def get_framebuffer(self): return self.framebuffer.copy()
 
 class Controller:
@@ -188,6 +192,8 @@ class NESEmulator:
         self.screen = tk.Canvas(screen_frame, bg='black',
                                 width=512, height=480, highlightthickness=0)
         self.screen.pack(expand=True)
+        self.photo = ImageTk.PhotoImage('RGB', (512, 480))  # update_screen pastes each frame here
+        self.screen_img_id = self.screen.create_image(0, 0, anchor=tk.NW, image=self.photo)
 
         self.root.bind('<KeyPress>', self.key_press)
         self.root.bind('<KeyRelease>', self.key_release)
@@ -237,10 +243,7 @@ class NESEmulator:
         if self.emulator:
             frame = self.emulator.get_frame()
             img = Image.fromarray(frame, 'RGB').resize((512, 480), Image.NEAREST)
-            photo = ImageTk.PhotoImage(img)
-            self.screen.delete("all")
-            self.screen.image = photo           # store ref
-            self.screen.create_image(0, 0, anchor=tk.NW, image=self.screen.image)  # stable
+            self.photo.paste(img)
 
     def run(self): self.root.mainloop()
 
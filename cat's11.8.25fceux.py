@@ -7,9 +7,61 @@
 import tkinter as tk
 from tkinter import Menu, messagebox, filedialog, simpledialog
 import struct
+import time
 import numpy as np
+from PIL import Image, ImageTk
 from typing import Optional
 
+# NES master palette (64 colors). Values approximate gamma-adjusted sRGB.
+# Source: widely published approximations; fine-tuned for readability.
+NES_PALETTE = np.array([
+    [84,  84,  84],[  0,  30, 116],[  8,  16, 144],[ 48,   0, 136],
+    [68,   0, 100],[92,   0,  48],[84,   4,   0],[60,  24,   0],
+    [32,  42,   0],[  8,  58,   0],[  0,  64,   0],[  0,  60,  0],
+    [  0,  50, 60],[  0,   0,   0],[  0,   0,   0],[  0,   0,   0],
+    [152, 150, 152],[  8,  76, 196],[ 48,  50, 236],[ 92,  30, 228],
+    [136,  20, 176],[160,  20, 100],[152,  34,  32],[120,  60,   0],
+    [ 84,  90,   0],[ 40, 114,   0],[  8, 124,   0],[  0, 118,  40],
+    [  0, 102, 120],[  0,   0,   0],[  0,   0,   0],[  0,   0,   0],
+    [236, 238, 236],[ 76, 154, 236],[120, 124, 236],[176,  98, 236],
+    [228,  84, 236],[236,  88, 180],[236, 106, 100],[212, 136,  32],
+    [160, 170,   0],[116, 196,   0],[ 76, 208,  32],[ 56, 204, 108],
+    [ 56, 180, 204],[ 60,  60,  60],[  0,   0,   0],[  0,   0,   0],
+    [236, 238, 236],[168, 204, 236],[188, 188, 236],[212, 178, 236],
+    [236, 174, 236],[236, 174, 212],[236, 180, 176],[228, 196, 144],
+    [204, 210, 120],[180, 222, 120],[168, 226, 144],[152, 226, 180],
+    [160, 214, 228],[160, 162, 160],[  0,   0,   0],[  0,   0,   0],
+], dtype=np.uint8)
+
+# Pattern byte -> its bits spread to the even bits of a 16-bit word (bit i -> bit 2i), so
+# SPREAD[low] | (SPREAD[high] << 1) packs a whole tile row as eight 2-bit pixels
+SPREAD = np.array([sum(((b >> i) & 1) << (2 * i) for i in range(8)) for b in range(256)], dtype=np.uint16)
+# Shifts that unpack such a row leftmost pixel (bit 7) first
+PIXEL_SHIFTS = np.arange(14, -1, -2, dtype=np.uint16)
+
+# Per tile of the 30x32 nametable: the vram offset of its attribute byte, and the shift
+# of its 2-bit palette select within that byte (quadrant: 0, 2, 4 or 6)
+ATTR_INDEX = 0x3C0 + (np.arange(30)[:, None] // 4) * 8 + np.arange(32) // 4
+ATTR_SHIFT = ((np.arange(32) & 2) | ((np.arange(30)[:, None] & 2) << 1)).astype(np.uint8)
+
+def decode_tiles(chr_data) -> np.ndarray:
+    # 16-byte planar tiles -> (n, 8, 8) 2-bit pixel values, [tile, row, column]
+    planes = np.frombuffer(chr_data, dtype=np.uint8).reshape(-1, 2, 8)
+    rows = SPREAD[planes[:, 0]] | (SPREAD[planes[:, 1]] << 1)
+    return ((rows[..., None] >> PIXEL_SHIFTS) & 3).astype(np.uint8)
+
+# CPU cycles run between PPU/APU syncs in step_frame
+CPU_BATCH_CYCLES = 512
+# Frame period the GUI schedules run_emulation against
+FRAME_SECONDS = 1 / 60
+
+# Byte value -> its N and Z status bits, so loads set both flags with one lookup
+_NZ = bytes((v & 0x80) | (0x02 if v == 0 else 0) for v in range(256))
+
+# Button -> its bit in NESBackend.input_state, in controller shift-register order
+BUTTON_BITS = {'A': 0x01, 'B': 0x02, 'SELECT': 0x04, 'START': 0x08,
+               'UP': 0x10, 'DOWN': 0x20, 'LEFT': 0x40, 'RIGHT': 0x80}
+
 # ───────────────────────────────────────────────
 # NES Backend with Full Emulation
 # ───────────────────────────────────────────────
@@ -26,7 +78,7 @@ class NESBackend:
         self.cycles = 0
         self.frame_count = 0
         self.running = False
-        self.input_state = {'A': False, 'B': False, 'SELECT': False, 'START': False, 'UP': False, 'DOWN': False, 'LEFT': False, 'RIGHT': False}
+        self.input_state = 0  # held buttons as a BUTTON_BITS mask
 
     def load_rom(self, path: str) -> bool:
         try:
@@ -37,9 +89,9 @@ class NESBackend:
                 prg_size = header[4] * 0x4000
                 chr_size = header[5] * 0x2000
                 mapper_id = (header[6] >> 4) | (header[7] & 0xF0)
-                self.mapper = Mapper(mapper_id, self)
                 self.rom_prg = f.read(prg_size)
                 self.rom_chr = f.read(chr_size) if chr_size else bytearray(0x2000)
+                self.mapper = Mapper(mapper_id, self)  # needs the ROM data for its bank views
                 self.cpu.reset()
                 self.ppu.load_chr(self.rom_chr)
                 return True
@@ -51,10 +103,12 @@ class NESBackend:
         self.running = True
         target_cycles = 29781  # Approx cycles per frame
         self.cycles = 0
+        cpu, ppu, apu = self.cpu, self.ppu, self.apu
         while self.cycles < target_cycles:
-            cycles = self.cpu.step()
-            self.ppu.step(cycles * 3)  # PPU runs 3x CPU speed
-            self.apu.step()
+            # Run a batch of instructions, then bring the PPU and APU up to date
+            cycles = cpu.run_until(cpu.cycles + min(CPU_BATCH_CYCLES, target_cycles - self.cycles))
+            ppu.step(cycles * 3)  # PPU runs 3x CPU speed
+            apu.step()
             self.cycles += cycles
         self.frame_count += 1
         return self.ppu.render_frame()
@@ -77,14 +131,14 @@ class Mapper:
         self.chr_banks = len(nes.rom_chr) // 0x2000
         self.prg_bank0 = 0
         self.prg_bank1 = self.prg_banks - 1 if self.prg_banks > 1 else 0
+        # 16KB views of the banks at $8000 and $C000 (the same bank twice for NROM-128)
+        prg = memoryview(nes.rom_prg)
+        self.bank0 = prg[self.prg_bank0 * 0x4000:(self.prg_bank0 + 1) * 0x4000]
+        self.bank1 = prg[self.prg_bank1 * 0x4000:(self.prg_bank1 + 1) * 0x4000]
 
     def read_prg(self, addr: int) -> int:
         if self.id == 0:  # NROM
-            if 0x8000 <= addr <= 0xBFFF:
-                offset = self.prg_bank0 * 0x4000 + (addr - 0x8000)
-            elif 0xC000 <= addr <= 0xFFFF:
-                offset = self.prg_bank1 * 0x4000 + (addr - 0xC000)
-            return self.nes.rom_prg[offset % len(self.nes.rom_prg)]
+            return (self.bank0 if addr < 0xC000 else self.bank1)[addr & 0x3FFF]
         return 0
 
     def write_prg(self, addr: int, value: int):
@@ -100,6 +154,11 @@ class Mapper:
 # CPU (Full 6502 Implementation)
 # ───────────────────────────────────────────────
 class CPU:
+    # Fixed slots rather than a per-instance __dict__: registers and tables are read on
+    # every instruction
+    __slots__ = ('nes', 'pc', 'sp', 'a', 'x', 'y', 'flags', 'cycles', 'flag_mask',
+                 'opcodes', '_read_page', '_write_page')
+
     def __init__(self, nes: NESBackend):
         self.nes = nes
         self.pc = 0
@@ -111,12 +170,15 @@ class CPU:
         self.cycles = 0
         self.flag_mask = {'C': 0x01, 'Z': 0x02, 'I': 0x04, 'D': 0x08, 'B': 0x10, 'U': 0x20, 'V': 0x40, 'N': 0x80}
 
-        # Opcode table (abridged for space; full in survey notes)
-        self.opcodes = {
-            0x00: self.brk, 0x01: self.ora,  # ... Add all 256, but truncated for example
-            0xA9: self.lda_imm,  # LDA immediate
-            # Add more as per full table from sources
-        }  # Full table would have 151 official opcodes, with addressing modes
+        # Opcode table indexed by opcode (abridged for space; full in survey notes)
+        self.opcodes = [self._illegal] * 256
+        self.opcodes[0x00] = self.brk
+        self.opcodes[0xA9] = self.lda_imm  # LDA immediate
+        # Add more as per full table from sources; 151 official opcodes, with addressing modes
+
+        # Bus handlers per 8KB page (addr >> 13): RAM, PPU registers, APU/IO, unmapped, PRG x4
+        self._read_page = [self._read_ram, self._read_ppu, self._read_io, self._read_open] + [self._read_prg] * 4
+        self._write_page = [self._write_ram, self._write_ppu, self._write_open, self._write_open] + [self._write_prg] * 4
 
     def reset(self):
         self.pc = self.read_word(0xFFFC)
@@ -128,36 +190,58 @@ class CPU:
     def step(self) -> int:
         opcode = self.read_byte(self.pc)
         self.pc += 1
-        if opcode in self.opcodes:
-            return self.opcodes[opcode]()
-        else:
-            print(f"Unknown opcode: 0x{opcode:02X}")
-            return 2  # Default cycles
+        return self.opcodes[opcode]()
+
+    def run_until(self, target: int) -> int:
+        # Fetch/decode/execute until self.cycles reaches target, with the dispatch table
+        # and bus read held in locals; returns the cycles spent
+        opcodes = self.opcodes
+        read_byte = self.read_byte
+        cycles = start = self.cycles
+        while cycles < target:
+            opcode = read_byte(self.pc)
+            self.pc += 1
+            cycles += opcodes[opcode]()
+        self.cycles = cycles
+        return cycles - start
 
     def read_byte(self, addr: int) -> int:
-        if addr < 0x2000:
-            return self.nes.ram[addr % 0x800]
-        elif addr < 0x4000:
-            return self.nes.ppu.read_reg(addr % 8 + 0x2000)
-        elif addr < 0x4018:
-            if addr == 0x4016:
-                # Input stub
-                return int(self.nes.input_state['A']) | (int(self.nes.input_state['B']) << 1)  # Etc
-            return 0
-        elif addr >= 0x8000:
-            return self.nes.mapper.read_prg(addr)
-        return 0
+        addr &= 0xFFFF
+        return self._read_page[addr >> 13](addr)
 
     def write_byte(self, addr: int, value: int):
-        if addr < 0x2000:
-            self.nes.ram[addr % 0x800] = value
-        elif addr < 0x4000:
-            self.nes.ppu.write_reg(addr % 8 + 0x2000, value)
-        elif addr < 0x4018:
-            # APU/input write stub
-            pass
-        elif addr >= 0x8000:
-            self.nes.mapper.write_prg(addr, value)
+        addr &= 0xFFFF
+        self._write_page[addr >> 13](addr, value)
+
+    def _read_ram(self, addr: int) -> int:
+        return self.nes.ram[addr & 0x7FF]
+
+    def _read_ppu(self, addr: int) -> int:
+        return self.nes.ppu.read_reg((addr & 7) + 0x2000)
+
+    def _read_io(self, addr: int) -> int:
+        if addr == 0x4016:
+            # Input stub
+            return self.nes.input_state & 0x03  # A, B; etc
+        return 0
+
+    def _read_open(self, addr: int) -> int:
+        return 0
+
+    def _read_prg(self, addr: int) -> int:
+        return self.nes.mapper.read_prg(addr)
+
+    def _write_ram(self, addr: int, value: int):
+        self.nes.ram[addr & 0x7FF] = value
+
+    def _write_ppu(self, addr: int, value: int):
+        self.nes.ppu.write_reg((addr & 7) + 0x2000, value)
+
+    def _write_open(self, addr: int, value: int):
+        pass  # APU/input write stub
+
+    def _write_prg(self, addr: int, value: int):
+        self.nes.mapper.write_prg(addr, value)
 
     def read_word(self, addr: int) -> int:
         return self.read_byte(addr) | (self.read_byte(addr + 1) << 8)
@@ -166,14 +250,17 @@ class CPU:
     def lda_imm(self) -> int:
         self.a = self.read_byte(self.pc)
         self.pc += 1
-        self.set_flags('Z', self.a == 0)
-        self.set_flags('N', self.a & 0x80)
+        self.flags = (self.flags & ~0x82) | _NZ[self.a]
         return 2
 
     def brk(self) -> int:
         # Full BRK implementation
         return 7
 
+    def _illegal(self) -> int:
+        print(f"Unknown opcode: 0x{self.read_byte(self.pc - 1):02X}")
+        return 2  # Default cycles
+
     def set_flags(self, flag: str, value: bool):
         if value:
             self.flags |= self.flag_mask[flag]
@@ -197,56 +284,46 @@ class PPU:
         self.fine_scroll = 0
         self.write_toggle = False
         self.chr = bytearray(0x2000)
+        self.pattern_cache = decode_tiles(self.chr)  # CHR decoded once per load
         self.oam = bytearray(0x100)
         self.palette = bytearray(0x20)
         self.framebuffer = np.zeros((240, 256, 3), dtype=np.uint8)
         self.nmi = False
 
-        # NES Palette RGB values (simplified)
-        self.colors = [
-            (84,84,84), (0,30,116), (8,16,144), (48,0,136), # Etc, full 64 colors
-            # Add all 64 RGB tuples here
-        ]
+        # NES Palette RGB values, (64, 3) uint8
+        self.colors = NES_PALETTE
 
     def load_chr(self, chr_data: bytes):
         self.chr = bytearray(chr_data)
+        self.pattern_cache = decode_tiles(self.chr)
 
     def step(self, cycles: int):
-        self.cycle += cycles
-        if self.cycle >= 341:
-            self.cycle -= 341
-            self.scanline += 1
-            if self.scanline == 241:
+        # A batch can span several scanlines: advance them all at once and only check
+        # whether vblank start (241) or the end of the frame (262) was crossed
+        lines, self.cycle = divmod(self.cycle + cycles, 341)
+        if lines:
+            line = self.scanline + lines
+            if self.scanline < 241 <= line:
                 self.status |= 0x80
                 if self.ctrl & 0x80:
                     self.nmi = True
-            if self.scanline >= 262:
-                self.scanline = 0
+            if line >= 262:
+                line -= 262
                 self.status &= ~0x80
                 self.nmi = False
+            self.scanline = line
 
     def render_frame(self) -> np.ndarray:
-        # Basic background rendering
-        for tile_y in range(30):
-            for tile_x in range(32):
-                name_addr = 0x2000 + tile_y * 32 + tile_x
-                tile_idx = self.nes.vram[name_addr - 0x2000]
-                attr_addr = 0x23C0 + (tile_y // 4) * 8 + (tile_x // 4)
-                attr = self.nes.vram[attr_addr - 0x2000]
-                palette_idx = (attr >> ((tile_x // 2 % 2) + (tile_y // 2 % 2 * 2))) & 0x03
-                pattern_addr = tile_idx * 16
-                for y in range(8):
-                    low = self.chr[pattern_addr + y]
-                    high = self.chr[pattern_addr + y + 8] << 1
-                    for x in range(8):
-                        pixel = (low & 0x80) >> 7 | (high & 0x80) >> 6
-                        low <<= 1
-                        high <<= 1
-                        if pixel:
-                            color = self.colors[self.palette[palette_idx * 4 + pixel] & 0x3F]
-                        else:
-                            color = self.colors[self.palette[0] & 0x3F]
-                        self.framebuffer[tile_y * 8 + y, tile_x * 8 + (7 - x), :] = color
+        # Basic background rendering, whole screen at once: gather every tile's decoded
+        # pattern and palette select, resolve to palette RAM values, then to RGB
+        vram = np.frombuffer(self.nes.vram, dtype=np.uint8)
+        tiles = vram[:0x3C0].reshape(30, 32)
+        palette_idx = (vram[ATTR_INDEX] >> ATTR_SHIFT) & 0x03  # (30, 32)
+        pix = self.pattern_cache[tiles].transpose(0, 2, 1, 3).reshape(240, 256)
+        sel = palette_idx.repeat(8, axis=0).repeat(8, axis=1)
+        # Pixel value 0 is the universal background color
+        pal_idx = (np.frombuffer(self.palette, dtype=np.uint8) & 0x3F)[np.where(pix, (sel << 2) | pix, 0)]
+        self.framebuffer[:] = self.colors[pal_idx]
         return self.framebuffer
 
     def read_reg(self, addr: int) -> int:
@@ -290,6 +367,8 @@ class CatsFCEUX:
         self.rom_path = None
         self.after_id = None
         self.paused = False
+        self._next_deadline = time.perf_counter()  # when the next frame is due
+        self._visible = True  # False while the window is minimized/unmapped
 
         menubar = Menu(self.root)
         self.root.config(menu=menubar)
@@ -315,24 +394,44 @@ class CatsFCEUX:
         self.canvas = tk.Label(self.root, bg="black")
         self.canvas.pack(fill=tk.BOTH, expand=True)
 
-        self.photo = tk.PhotoImage(width=256, height=240)
+        # Frames are pasted into this one image; see run_emulation
+        self.photo = ImageTk.PhotoImage('RGB', (256, 240))
         self.canvas.config(image=self.photo)
 
         self.root.bind("<Escape>", lambda e: self.root.quit())
-        # Input bindings
+        self.root.bind("<Map>", self._on_map)
+        self.root.bind("<Unmap>", self._on_unmap)
+        # Input bindings: one handler per event type, keysym -> button bit
         key_map = {'z': 'A', 'x': 'B', 'a': 'SELECT', 's': 'START', 'Up': 'UP', 'Down': 'DOWN', 'Left': 'LEFT', 'Right': 'RIGHT'}
-        for key, button in key_map.items():
-            self.root.bind(f"<KeyPress-{key}>", lambda e, b=button: self.set_input(b, True))
-            self.root.bind(f"<KeyRelease-{key}>", lambda e, b=button: self.set_input(b, False))
+        self._key_bits = {key: BUTTON_BITS[button] for key, button in key_map.items()}
+        self.root.bind("<KeyPress>", self._key_down)
+        self.root.bind("<KeyRelease>", self._key_up)
+
+    def _on_map(self, event):
+        if event.widget is self.root:
+            self._visible = True
+
+    def _on_unmap(self, event):
+        # Emulation keeps running while hidden; only the frame upload is skipped
+        if event.widget is self.root:
+            self._visible = False
+
+    def _key_down(self, event):
+        bit = self._key_bits.get(event.keysym)
+        if bit:
+            self.nes.input_state |= bit
 
-    def set_input(self, button, state):
-        self.nes.input_state[button] = state
+    def _key_up(self, event):
+        bit = self._key_bits.get(event.keysym)
+        if bit:
+            self.nes.input_state &= ~bit
 
     def load_rom(self):
         path = filedialog.askopenfilename(filetypes=[("NES ROM", "*.nes")])
         if path and self.nes.load_rom(path):
             self.rom_path = path
             messagebox.showinfo("Loaded", f"ROM loaded: {path.split('/')[-1]}")
+            self._next_deadline = time.perf_counter()
             self.run_emulation()
         else:
             messagebox.showerror("Error", "Invalid or unreadable ROM file.")
@@ -340,16 +439,24 @@ class CatsFCEUX:
     def run_emulation(self):
         if not self.paused and self.rom_path:
             frame = self.nes.step_frame()
-            # Update PhotoImage
-            hex_data = " ".join(f"#{r:02x}{g:02x}{b:02x}" for row in frame for r,g,b in row)
-            self.photo.put("{" + hex_data + "}", to=(0, 0))
-            self.after_id = self.root.after(16, self.run_emulation)
+            now = time.perf_counter()
+            if now > self._next_deadline + 0.1:
+                # Too far behind: drop this frame's upload and restart the schedule from now
+                self._next_deadline = now
+            elif self._visible:
+                # Update PhotoImage straight from the RGB framebuffer
+                self.photo.paste(Image.fromarray(frame, 'RGB'))
+            # Wait only for what is left of the frame period, not a fixed 16 ms
+            self._next_deadline += FRAME_SECONDS
+            delay = max(1, int((self._next_deadline - now) * 1000))
+            self.after_id = self.root.after(delay, self.run_emulation)
         elif self.after_id:
             self.root.after_cancel(self.after_id)
 
     def toggle_pause(self):
         self.paused = not self.paused
         if not self.paused:
+            self._next_deadline = time.perf_counter()
             self.run_emulation()
 
     def show_debugger(self):
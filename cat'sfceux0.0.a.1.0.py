@@ -17,15 +17,14 @@ class MirrorType(Enum):
 # Mapper & Cartridge
 # ──────────────────────────────
 class Mapper:
-    def __init__(self, cartridge): self.cartridge = cartridge
+    def __init__(self, cartridge):
+        self.cartridge = cartridge
+        # 16KB views at $8000 and $C000; NROM-128 mirrors its one bank into both
+        prg = memoryview(cartridge.prg_rom)
+        self.bank0 = prg[:0x4000]
+        self.bank1 = prg[0x4000:0x8000] if cartridge.prg_banks > 1 else self.bank0
     def prg_read(self, addr: int) -> int:
-        addr -= 0x8000
-        # Safe mirroring for NROM-128
-        if self.cartridge.prg_banks == 1:
-            addr %= 0x4000
-        else:
-            addr %= len(self.cartridge.prg_rom)
-        return self.cartridge.prg_rom[addr]
+        return (self.bank0 if addr < 0xC000 else self.bank1)[addr & 0x3FFF]
     def prg_write(self, addr: int, value: int): pass
     def chr_read(self, addr: int) -> int: return self.cartridge.chr_rom[addr]
     def chr_write(self, addr: int, value: int): pass
@@ -34,8 +33,7 @@ class Cartridge:
     def __init__(self, rom_data: bytes):
         if rom_data[0:4] != b'NES\x1A':
             raise ValueError("Invalid NES ROM header")
-        prg_banks = rom_data[4]; chr_banks = rom_data[5]
-        flag6 = rom_data[6]; flag7 = rom_data[7]
+        prg_banks, chr_banks, flag6, flag7 = struct.unpack_from('<BBBB', rom_data, 4)
         self.mapper_type = (flag6 >> 4) | (flag7 & 0xF0)
         if flag6 & 0x08:
             self.mirroring = MirrorType.FOUR_SCREEN
@@ -43,7 +41,7 @@ class Cartridge:
             self.mirroring = MirrorType.VERTICAL if flag6 & 0x01 else MirrorType.HORIZONTAL
         prg_size = prg_banks * 0x4000; chr_size = chr_banks * 0x2000
         offset = 16 + (512 if flag6 & 0x04 else 0)
-        self.prg_rom = rom_data[offset:offset + prg_size]
+        self.prg_rom = memoryview(rom_data)[offset:offset + prg_size]  # no copy of PRG
         self.chr_rom = rom_data[offset + prg_size:offset + prg_size + chr_size]
         self.prg_banks = prg_banks; self.chr_banks = chr_banks
 
@@ -52,19 +50,19 @@ class Cartridge:
 # ──────────────────────────────
 class Memory:
     def __init__(self, cartridge: Optional[Cartridge] = None):
-        self.ram = [0]*0x800
-        self.palette_ram = [0]*0x20
+        self.ram = bytearray(0x800)
+        self.palette_ram = bytearray(0x20)
         self.cartridge = cartridge
         self.mapper = Mapper(cartridge) if cartridge else None
     def read(self, addr: int) -> int:
         if 0x0000 <= addr < 0x2000:
-            return self.ram[addr % 0x800]
+            return self.ram[addr & 0x7FF]
         elif 0x8000 <= addr < 0x10000 and self.mapper:
             return self.mapper.prg_read(addr)
         return 0
     def write(self, addr: int, value: int):
         if 0x0000 <= addr < 0x2000:
-            self.ram[addr % 0x800] = value
+            self.ram[addr & 0x7FF] = value & 0xFF
         elif 0x8000 <= addr < 0x10000 and self.mapper:
             self.mapper.prg_write(addr, value)
 
@@ -91,7 +89,7 @@ class CPU:
 
 class PPU:
     def __init__(self): self.framebuffer = np.zeros((240,256,3),dtype=np.uint8)
-    def get_framebuffer(self): return self.framebuffer.copy()
+    def get_framebuffer(self): return self.framebuffer  # callers only read it
 
 # ──────────────────────────────
 # Emulator core
@@ -132,6 +130,11 @@ class NESEmulator:
         # One canvas for everything
         self.canvas = tk.Canvas(self.root,bg='black',width=512,height=520,highlightthickness=0)
         self.canvas.pack(expand=True)
+        # One PhotoImage and canvas item for the picture; update_canvas pastes into it
+        self._photo = ImageTk.PhotoImage('RGB',(512,480))
+        self._scaled = np.empty((480,512,3),np.uint8)  # 2x frame, reused every update
+        self._img_id = self.canvas.create_image(0,0,anchor=tk.NW,image=self._photo)
+        self._hud_text = self.canvas.create_text(256,500,text="",fill="lime",font=("Consolas",12,"bold"))
 
     def load_rom(self):
         file = filedialog.askopenfilename(title="Load NES ROM",filetypes=[("NES ROMs","*.nes")])
@@ -155,11 +158,9 @@ class NESEmulator:
     def update_canvas(self):
         emu = self.emulator
         frame = emu.get_frame()
-        img = Image.fromarray(frame,'RGB').resize((512,480),Image.NEAREST)
-        photo = ImageTk.PhotoImage(img)
-        self.canvas.image = photo
-        self.canvas.delete("all")
-        self.canvas.create_image(0,0,anchor=tk.NW,image=photo)
+        # 2x nearest-neighbour by broadcasting into the reused buffer; PIL wraps it without a copy
+        self._scaled.reshape(240,2,256,2,3)[:] = frame[:,None,:,None]
+        self._photo.paste(Image.frombuffer('RGB',(512,480),self._scaled,'raw','RGB',0,1))
 
         # backend / debug info
         cpu = emu.cpu
@@ -168,7 +169,7 @@ class NESEmulator:
             f"A={cpu.a:02X} X={cpu.x:02X} Y={cpu.y:02X}  "
             f"SP={cpu.sp:02X}  CYCLES={cpu.cycles}"
         )
-        self.canvas.create_text(256,500,text=text,fill="lime",font=("Consolas",12,"bold"))
+        self.canvas.itemconfig(self._hud_text,text=text)
 
     def run(self): self.root.mainloop()
 
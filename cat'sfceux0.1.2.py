@@ -38,12 +38,14 @@ class MirrorType(Enum):
 
 class Mapper0:
     """NROM Mapper"""
-    def __init__(self, cart): self.cart = cart
+    def __init__(self, cart):
+        self.cart = cart
+        # 16KB views at $8000 and $C000; NROM-128 mirrors its one bank into both
+        prg = memoryview(cart.prg_rom)
+        self.bank0 = prg[:0x4000]
+        self.bank1 = prg[0x4000:0x8000] if cart.prg_banks > 1 else self.bank0
     def prg_read(self, addr):
-        addr -= 0x8000
-        if self.cart.prg_banks == 1:
-            addr %= 0x4000
-        return self.cart.prg_rom[addr]
+        return (self.bank0 if addr < 0xC000 else self.bank1)[addr & 0x3FFF]
     def prg_write(self, addr, val): pass
     def chr_read(self, addr):
         return self.cart.chr_rom[addr] if not self.cart.has_chr_ram else self.cart.chr_ram[addr]
@@ -71,7 +73,7 @@ class Cartridge:
         self.chr_rom = data[chr_start:chr_start + chr_size] if chr_size else bytes()
         self.prg_banks, self.chr_banks = prg_banks, chr_banks
         self.has_chr_ram = chr_banks == 0
-        self.chr_ram = [0]*0x2000 if self.has_chr_ram else []
+        self.chr_ram = bytearray(0x2000) if self.has_chr_ram else bytearray()
 
 
 # ──────────────────────────────
@@ -79,7 +81,7 @@ class Cartridge:
 # ──────────────────────────────
 class Memory:
     def __init__(self, cart=None):
-        self.ram = [0]*0x800; self.palette_ram = [0]*0x20
+        self.ram = bytearray(0x800); self.palette_ram = bytearray(0x20)
         self.cart = cart; self.mapper = Mapper0(cart) if cart else None
     def read(self, addr):
         addr &= 0xFFFF
@@ -109,13 +111,24 @@ class CPU:
         for f in self.listeners:
             try: f(self, op)
             except: pass
-    def exec_instructions(self, count): [self.step() for _ in range(count)]
+    def exec_instructions(self, count):
+        if self.listeners:
+            step = self.step
+            for _ in range(count): step()
+            return
+        if count <= 0: return
+        # Nobody observes single steps: run the fetch loop on locals, store state once
+        mem_read = self.memory.read; pc = self.pc
+        for _ in range(count):
+            op = mem_read(pc); pc = (pc + 1) & 0xFFFF
+        self.last_pc = (pc - 1) & 0xFFFF; self.pc = pc
+        self.last_opcode = op; self.cycles += 2 * count
 
 
 class PPU:
     def __init__(self):
         self.framebuffer = np.zeros((BASE_HEIGHT, BASE_WIDTH, 3), np.uint8)
-    def get_framebuffer(self): return self.framebuffer.copy()
+    def get_framebuffer(self): return self.framebuffer  # callers only read it
 
 
 # ──────────────────────────────
@@ -144,6 +157,7 @@ class CatsFCEUXApp:
         self.emu: Optional[Emulator] = None
         self.speed = 1.0; self.limit_fps = True
         self.trace_log=[]; self.frames=0; self.fps=0; self.last_time=time.time()
+        self._visible = True  # False while the window is minimized/unmapped
         self._build_ui(); self._bind_hotkeys()
 
     def _build_ui(self):
@@ -169,18 +183,42 @@ class CatsFCEUXApp:
             highlightthickness=0
         )
         self.canvas.pack(fill="both", expand=True)
+        # One PhotoImage and canvas item for the picture; update_canvas pastes into it
+        self._photo = ImageTk.PhotoImage("RGB", (BASE_WIDTH*self.scale, BASE_HEIGHT*self.scale))
+        self._scaled = np.empty((BASE_HEIGHT*self.scale, BASE_WIDTH*self.scale, 3), np.uint8)  # upscaled frame
+        self._img_id = self.canvas.create_image(0,0,anchor="nw",image=self._photo)
+        # HUD bar and placeholder are created once too; update_canvas only changes their text
+        self._hud_rect = self.canvas.create_rectangle(
+            0, BASE_HEIGHT*self.scale,
+            BASE_WIDTH*self.scale, BASE_HEIGHT*self.scale+40,
+            fill="#111", outline="#333"
+        )
+        self._hud_text = self.canvas.create_text(6, BASE_HEIGHT*self.scale+20,
+            text="", fill="#7CFC00", font=("Consolas",11), anchor="w"
+        )
+        self._msg_id = self.canvas.create_text(
+            (BASE_WIDTH*self.scale)//2,
+            (BASE_HEIGHT*self.scale)//2,
+            fill="gray",
+            text="No ROM Loaded",
+            font=("Consolas",16)
+        )
         self.status = tk.StringVar(value="No ROM loaded")
         ttk.Label(self.root, textvariable=self.status, anchor="w").pack(fill="x")
 
     def _bind_hotkeys(self):
         self.root.bind("<space>", lambda e: self.toggle_run())
         self.root.bind("<Control-o>", lambda e: self.open_rom())
+        # Keep emulating while minimized, but skip the canvas upload
+        self.root.bind("<Map>", lambda e: e.widget is self.root and setattr(self, "_visible", True))
+        self.root.bind("<Unmap>", lambda e: e.widget is self.root and setattr(self, "_visible", False))
 
     def open_rom(self):
         path = filedialog.askopenfilename(filetypes=[("NES ROM", "*.nes")])
         if not path: return
         try:
             self.emu = Emulator(path)
+            self.canvas.itemconfig(self._msg_id, state="hidden")
             self.status.set(f"Loaded: {os.path.basename(path)} | Mapper {self.emu.cart.mapper_type}")
             self.update_canvas(force=True)
         except Exception as e:
@@ -204,7 +242,7 @@ class CatsFCEUXApp:
     def run_loop(self):
         if not self.running or not self.emu: return
         self.emu.run_frame()
-        self.update_canvas()
+        if self._visible: self.update_canvas()
         now=time.time()
         if now-self.last_time>0.5:
             self.fps=self.frames/(now-self.last_time)
@@ -215,34 +253,20 @@ class CatsFCEUXApp:
         self.root.after(delay, self.run_loop)
 
     def update_canvas(self, force=False):
-        self.canvas.delete("all")
         if not self.emu:
-            self.canvas.create_text(
-                (BASE_WIDTH*self.scale)//2,
-                (BASE_HEIGHT*self.scale)//2,
-                fill="gray",
-                text="No ROM Loaded",
-                font=("Consolas",16)
-            )
             return
 
         frame = self.emu.get_frame()
-        pil = Image.fromarray(frame).resize(
-            (BASE_WIDTH*self.scale, BASE_HEIGHT*self.scale), Image.NEAREST
-        )
-        img = ImageTk.PhotoImage(pil)
-        self.canvas.image = img
-        self.canvas.create_image(0,0,anchor="nw",image=img)
-        self.canvas.create_rectangle(
-            0, BASE_HEIGHT*self.scale,
-            BASE_WIDTH*self.scale, BASE_HEIGHT*self.scale+40,
-            fill="#111", outline="#333"
-        )
+        # Integer nearest-neighbour upscale by broadcasting into the reused buffer, which
+        # PIL then wraps without copying
+        s = self.scale
+        self._scaled.reshape(BASE_HEIGHT, s, BASE_WIDTH, s, 3)[:] = frame[:, None, :, None]
+        self._photo.paste(Image.frombuffer(
+            "RGB", (BASE_WIDTH*s, BASE_HEIGHT*s), self._scaled, "raw", "RGB", 0, 1
+        ))
         cpu=self.emu.cpu
         hud=f"PC=${cpu.pc:04X}  OPCODE=${cpu.last_opcode:02X}  CYC={cpu.cycles}"
-        self.canvas.create_text(6, BASE_HEIGHT*self.scale+20,
-            text=hud, fill="#7CFC00", font=("Consolas",11), anchor="w"
-        )
+        self.canvas.itemconfig(self._hud_text, text=hud)
 
     def run(self):
         self.update_canvas(force=True)
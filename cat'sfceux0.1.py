@@ -4,9 +4,17 @@
 import tkinter as tk
 from tkinter import Menu, messagebox, filedialog, simpledialog
 import struct
+import time
+import queue
+import threading
 import numpy as np
 from typing import Optional
 
+# Binary PPM (P6) header for one 256x240 RGB frame; Tk decodes the pixel bytes in C
+PPM_HEADER = b"P6\n256 240\n255\n"
+FRAME_SECONDS = 1 / 60  # emulation pacing on the worker thread
+MAX_BLOCK_INSNS = 64  # longest straight-line run compiled into one block
+
 # ───────────────────────────────────────────────
 # NES Backend Skeleton
 # ───────────────────────────────────────────────
@@ -48,12 +56,11 @@ class NESBackend:
     def step_frame(self) -> np.ndarray:
         self.running = True
         target_cycles = 29781
-        self.cycles = 0
-        while self.cycles < target_cycles:
-            self.cpu.step(self.ram, self.ppu, self.mapper, self.input_state)
-            self.ppu.step(self.cycles % 3)
-            self.apu.step()
-            self.cycles += 1
+        # one instruction and one PPU dot per slot, run as a batch per unit
+        self.cpu.run(target_cycles, self.ram, self.mapper)
+        self.ppu.advance(target_cycles)
+        self.apu.run(target_cycles)
+        self.cycles = target_cycles
         self.frame_count += 1
         return self.ppu.render_frame(self.vram)
 
@@ -69,16 +76,21 @@ class NESBackend:
 # CPU / PPU / APU / Mapper
 # ───────────────────────────────────────────────
 class CPU:
+    # Fixed register set: slot access is cheaper than an instance __dict__
+    __slots__ = ('pc', 'sp', 'a', 'x', 'y', 'flags', 'cycles', 'mapper', 'block_cache')
+
     def __init__(self):
         self.pc = 0x0000
         self.sp = 0xFD
         self.a = self.x = self.y = 0
         self.flags = 0x24
         self.cycles = 0
+        self.block_cache = {}  # PC -> folded block (end PC, A or None), PRG ROM only
 
     def reset(self, prg: bytes, mapper):
         self.mapper = mapper
-        self.mapper.prg_bank = prg
+        self.mapper.set_prg(prg)
+        self.block_cache.clear()  # blocks were compiled from the old PRG
         # NES reset vector: bytes at 0x7FFC/0x7FFD in PRG
         if len(prg) >= 0x8000:
             self.pc = struct.unpack('<H', prg[-6:-4])[0]
@@ -86,13 +98,56 @@ class CPU:
             self.pc = 0x8000
 
     def step(self, ram, ppu, mapper, input_state):
-        # minimal no-op loop
-        opcode = self.fetch(ram, mapper)
-        if opcode == 0xA9:  # LDA imm
-            self.a = self.fetch(ram, mapper)
-            self.cycles += 2
-        else:
-            self.cycles += 2
+        self.run(1, ram, mapper)
+
+    def run(self, count: int, ram, mapper):
+        # Code in PRG ROM runs a compiled block at a time; code fetched from RAM
+        # (no PRG loaded) may change under us, so it is always interpreted
+        if not mapper.prg_bank:
+            self._interpret(count, ram, mapper)
+            return
+        cache = self.block_cache
+        pc = self.pc
+        blocks, rest = divmod(count, MAX_BLOCK_INSNS)
+        for _ in range(blocks):
+            blk = cache.get(pc)
+            if blk is None:
+                blk = cache[pc] = self._compile_block(pc, mapper)
+            pc, a = blk
+            if a is not None:
+                self.a = a
+        self.pc = pc
+        self.cycles += 2 * MAX_BLOCK_INSNS * blocks
+        self._interpret(rest, ram, mapper)
+
+    def _interpret(self, count: int, ram, mapper):
+        # minimal no-op loop over `count` instructions, PC kept in a local
+        read_prg = mapper.read_prg
+        pc = self.pc
+        for _ in range(count):
+            opcode = read_prg(pc, ram)
+            pc = (pc + 1) & 0xFFFF
+            if opcode == 0xA9:  # LDA imm
+                self.a = read_prg(pc, ram)
+                pc = (pc + 1) & 0xFFFF
+        self.pc = pc
+        self.cycles += 2 * count
+
+    def _compile_block(self, start: int, mapper):
+        # Decode MAX_BLOCK_INSNS instructions from `start` and fold their combined
+        # effect to constants. The stub decoder has no control flow or stores, so
+        # a block reduces to its end PC and the last value loaded into A (if any);
+        # that pair is applied directly rather than through generated code.
+        read_prg = mapper.read_prg
+        pc = start
+        a = None
+        for _ in range(MAX_BLOCK_INSNS):
+            opcode = read_prg(pc, None)
+            pc = (pc + 1) & 0xFFFF
+            if opcode == 0xA9:  # LDA imm
+                a = read_prg(pc, None)
+                pc = (pc + 1) & 0xFFFF
+        return pc, a
 
     def fetch(self, ram, mapper):
         val = mapper.read_prg(self.pc, ram)
@@ -106,11 +161,26 @@ class PPU:
         self.cycle = 0
         self.ctrl = self.mask = self.status = 0
         self.chr = bytearray(0x2000)
-        self.framebuffer = np.zeros((240, 256, 3), dtype=np.uint8)
+        # The framebuffer is a view into a ready-made PPM image, so the
+        # frontend can hand the frame to Tk without re-packing it
+        self._ppm = bytearray(PPM_HEADER) + bytearray(240 * 256 * 3)
+        self.framebuffer = np.frombuffer(self._ppm, dtype=np.uint8,
+                                         offset=len(PPM_HEADER)).reshape(240, 256, 3)
+        # placeholder grayscale ramp (one shade per row), expanded to a full frame once
+        gray = ((np.arange(240) * 255) // 239).astype(np.uint8)
+        self._pattern = np.broadcast_to(gray[:, None, None], self.framebuffer.shape).copy()
         self.nmi = False
 
     def load_chr(self, chr_data: bytes):
         self.chr = bytearray(chr_data)
+        self.fill((0, 0, 0))
+
+    def fill(self, rgb):
+        # Paint one row pixel by pixel, then copy it down the frame row by row;
+        # much cheaper than broadcasting a 3-byte colour over every pixel
+        row = self.framebuffer[0]
+        row[:] = rgb
+        self.framebuffer[1:] = row
 
     def step(self, cpu_cycle: int):
         self.cycle += 1
@@ -120,16 +190,24 @@ class PPU:
             if self.scanline >= 262:
                 self.scanline = 0
 
+    def advance(self, dots: int):
+        # same as `dots` calls to step()
+        lines, self.cycle = divmod(self.cycle + dots, 341)
+        self.scanline = (self.scanline + lines) % 262
+
     def render_frame(self, vram: bytearray) -> np.ndarray:
-        # generate grayscale pattern as placeholder
-        for y in range(240):
-            shade = (y * 255) // 239
-            self.framebuffer[y, :, :] = [shade, shade, shade]
+        # grayscale placeholder: one contiguous copy of the prebuilt frame
+        np.copyto(self.framebuffer, self._pattern)
         return self.framebuffer
 
+    def ppm(self) -> bytes:
+        # current frame as a complete binary PPM image
+        return bytes(self._ppm)
+
 
 class APU:
     def step(self): pass
+    def run(self, cycles: int): pass
     def read(self, reg: int) -> int: return 0
 
 
@@ -137,17 +215,27 @@ class Mapper:
     def __init__(self, id: int):
         self.id = id
         self.prg_bank = bytearray()
+        self._prg_mask = 0
+
+    def set_prg(self, prg: bytes):
+        self.prg_bank = prg
+        # PRG images are 16K/32K, so the wrap is an AND; odd sizes keep the modulo
+        size = len(prg)
+        self._prg_mask = size - 1 if size & (size - 1) == 0 else 0
 
     def read_prg(self, addr: int, ram: bytearray) -> int:
         if not self.prg_bank:
-            return ram[addr % len(ram)]
+            return ram[addr & 0x7FF]
         offset = addr - 0x8000
+        if self._prg_mask:
+            return self.prg_bank[offset & self._prg_mask]
         return self.prg_bank[offset % len(self.prg_bank)]
 
 
 # ───────────────────────────────────────────────
 # Tkinter Frontend (fixed)
 # ───────────────────────────────────────────────
+
 class CatsFCEUX:
     def __init__(self):
         self.root = tk.Tk()
@@ -159,6 +247,11 @@ class CatsFCEUX:
         self.rom_path = None
         self.after_id = None
         self.paused = False
+        # step_frame runs on a worker thread; finished PPM frames come back
+        # through a one-slot queue and the Tk side only blits the newest
+        self._frame_q = queue.Queue(maxsize=1)
+        self._worker = None
+        self._worker_stop = None
 
         menubar = Menu(self.root)
         self.root.config(menu=menubar)
@@ -193,9 +286,13 @@ class CatsFCEUX:
     # ─── File / ROM ──────────────────────────────
     def load_rom(self):
         path = filedialog.askopenfilename(filetypes=[("NES ROM", "*.nes")])
+        if path:
+            self._stop_worker()
         if path and self.nes.load_rom(path):
             self.rom_path = path
             messagebox.showinfo("Loaded", f"ROM loaded: {path.split('/')[-1]}")
+            if not self.paused:
+                self._start_worker()
             self.run_emulation()
         else:
             messagebox.showerror("Error", "Invalid or unreadable ROM file.")
@@ -203,20 +300,61 @@ class CatsFCEUX:
     # ─── Emulation Loop ──────────────────────────
     def run_emulation(self):
         if not self.paused and self.rom_path:
-            frame = self.nes.step_frame()
-            # Update PhotoImage buffer
-            rgb = (frame[:, :, 0] << 16) | (frame[:, :, 1] << 8) | frame[:, :, 2]
-            hex_data = " ".join(f"#{r:06x}" for r in rgb.flatten())
-            self.photo.put("{" + hex_data + "}", to=(0, 0))
+            try:
+                ppm = self._frame_q.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                # Reload the persistent PhotoImage from the frame as binary PPM
+                self.photo.configure(data=ppm, format="PPM")
             self.after_id = self.root.after(16, self.run_emulation)
         elif self.after_id:
             self.root.after_cancel(self.after_id)
 
     def toggle_pause(self):
         self.paused = not self.paused
-        if not self.paused:
+        if self.paused:
+            self._stop_worker()
+        else:
+            if self.rom_path:
+                self._start_worker()
             self.run_emulation()
 
+    def _start_worker(self):
+        self._stop_worker()
+        self._worker_stop = threading.Event()
+        self._worker = threading.Thread(target=self._emulation_worker,
+                                        args=(self._worker_stop,), daemon=True)
+        self._worker.start()
+
+    def _stop_worker(self):
+        if self._worker:
+            self._worker_stop.set()
+            self._worker.join()
+            self._worker = None
+        try:
+            self._frame_q.get_nowait()  # drop a frame the old worker left behind
+        except queue.Empty:
+            pass
+
+    def _emulation_worker(self, stop):
+        # Runs off the Tk thread: emulate at ~60 FPS, keep only the newest frame
+        deadline = time.perf_counter()
+        while not stop.is_set():
+            self.nes.step_frame()
+            ppm = self.nes.ppu.ppm()  # immutable snapshot, safe to hand over
+            try:
+                self._frame_q.get_nowait()
+            except queue.Empty:
+                pass
+            self._frame_q.put_nowait(ppm)
+            deadline += FRAME_SECONDS
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                stop.wait(delay)
+            else:
+                deadline = time.perf_counter()  # fell behind; don't try to catch up
+
     def show_debugger(self):
         addr = simpledialog.askinteger("Debugger", "RAM Addr (hex):")
         if addr is not None:
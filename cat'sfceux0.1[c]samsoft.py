@@ -5,6 +5,9 @@ from PIL import Image, ImageTk
 import sys
 import os
 import struct
+import time
+import queue
+import threading
 from enum import Enum
 from typing import Optional, List, Dict, Tuple
 
@@ -31,45 +34,75 @@ class Cartridge:
 
 class Memory:
     def __init__(self, cartridge: Optional[Cartridge] = None):
-        self.ram = [0] * 0x800
-        self.vram = [0] * 0x1000
-        self.oam = [0] * 0x100
+        # uint8 arrays over bytearrays: the handlers index the bytearrays
+        # (fast scalar access), debug views and DMA use the array side
+        self._ram = bytearray(0x800)
+        self._vram = bytearray(0x1000)
+        self.ram = np.frombuffer(self._ram, dtype=np.uint8)
+        self.vram = np.frombuffer(self._vram, dtype=np.uint8)
+        self.oam = np.zeros(0x100, dtype=np.uint8)
         self.cartridge = cartridge
         self.mapper = None  # Will be set based on cartridge
         self.controller = None
+        # One handler per 256-byte page, so read/write cost a single lookup
+        prg = self._read_prg if cartridge else self._read_open
+        self._read_page = ([self._read_ram] * 0x20 + [self._read_vram] * 0x20 +
+                           [self._read_io] + [self._read_open] * 0x3F + [prg] * 0x80)
+        self._write_page = ([self._write_ram] * 0x20 + [self._write_vram] * 0x20 +
+                            [self._write_io] + [self._write_open] * 0xBF)
 
     def read(self, addr: int) -> int:
-        if 0x0000 <= addr < 0x2000:
-            return self.ram[addr % 0x800]
-        elif 0x2000 <= addr < 0x4000:
-            return self.vram[(addr % 0x1000) % 0x800]  # Simplified mirroring
-        elif 0x4000 <= addr < 0x4020:
-            # PPU registers - simplified
-            if addr == 0x4016 and self.controller:
-                return self.controller.read()
+        if addr > 0xFFFF:
             return 0
-        elif 0x8000 <= addr < 0x10000 and self.cartridge:
-            # PRG ROM - simplified for NROM
-            bank = addr // 0x4000
-            offset = addr % 0x4000
-            if bank == 0 or self.cartridge.prg_banks == 1:
-                return self.cartridge.prg_rom[offset]
-            else:
-                return self.cartridge.prg_rom[0x4000 + offset]
-        return 0
+        return self._read_page[addr >> 8](addr)
 
     def write(self, addr: int, value: int):
-        if 0x0000 <= addr < 0x2000:
-            self.ram[addr % 0x800] = value
-        elif 0x2000 <= addr < 0x4000:
-            self.vram[(addr % 0x1000) % 0x800] = value
-        elif 0x4000 <= addr < 0x4020:
-            # PPU registers - simplified
-            if addr == 0x4016 and self.controller:
-                self.controller.write(value)
-            pass
+        if addr <= 0xFFFF:
+            self._write_page[addr >> 8](addr, value)
+
+    def _read_ram(self, addr: int) -> int:
+        return self._ram[addr & 0x7FF]
+
+    def _read_vram(self, addr: int) -> int:
+        return self._vram[addr & 0x7FF]  # Simplified mirroring
+
+    def _read_io(self, addr: int) -> int:
+        # PPU registers - simplified
+        if addr == 0x4016 and self.controller:
+            return self.controller.read()
+        return 0
+
+    def _read_open(self, addr: int) -> int:
+        return 0
+
+    def _read_prg(self, addr: int) -> int:
+        # PRG ROM - simplified for NROM
+        offset = addr & 0x3FFF
+        if self.cartridge.prg_banks == 1:
+            return self.cartridge.prg_rom[offset]
+        return self.cartridge.prg_rom[0x4000 + offset]
+
+    def _write_ram(self, addr: int, value: int):
+        self._ram[addr & 0x7FF] = value & 0xFF
+
+    def _write_vram(self, addr: int, value: int):
+        self._vram[addr & 0x7FF] = value & 0xFF
+
+    def _write_io(self, addr: int, value: int):
+        # PPU registers - simplified
+        if addr == 0x4016 and self.controller:
+            self.controller.write(value)
+
+    def _write_open(self, addr: int, value: int):
+        pass
+
+# Z and N flag bits for every byte value, indexed by the result
+ZN_FLAGS = bytes((0x02 if v == 0 else 0) | (v & 0x80) for v in range(256))
 
 class CPU:
+    # Fixed register set: slot access is cheaper than an instance __dict__
+    __slots__ = ('memory', 'a', 'x', 'y', 'sp', 'pc', 'flags', 'cycles', '_dispatch')
+
     def __init__(self, memory: Memory):
         self.memory = memory
         self.a = 0  # Accumulator
@@ -79,6 +112,10 @@ class CPU:
         self.pc = 0x8000  # Program counter - starts at reset vector
         self.flags = 0  # Status flags
         self.cycles = 0
+        # Opcode -> handler; unimplemented opcodes skip their operand byte
+        self._dispatch = [self._skip] * 256
+        self._dispatch[0xA9] = self._lda_imm
+        self._dispatch[0xAD] = self._lda_abs
 
     def reset(self):
         self.pc = self.memory.read(0xFFFC) | (self.memory.read(0xFFFD) << 8)
@@ -86,36 +123,42 @@ class CPU:
         self.a = self.x = self.y = 0
         self.flags = 0x24  # Set unused and break flags
 
-    def execute_instruction(self):
+    def execute_instruction(self) -> int:
+        # Returns the instruction's cycle cost; self.cycles keeps the running total
         opcode = self.memory.read(self.pc)
         self.pc += 1
-        self.cycles += self.get_instruction_cycles(opcode)
-        
-        # Simplified instruction execution - implement actual opcodes
-        if opcode == 0xA9:  # LDA Immediate
-            self.a = self.memory.read(self.pc)
-            self.pc += 1
-            self.set_zero_negative_flags(self.a)
-        elif opcode == 0xAD:  # LDA Absolute
-            addr = self.memory.read(self.pc) | (self.memory.read(self.pc + 1) << 8)
-            self.pc += 2
-            self.a = self.memory.read(addr)
-            self.set_zero_negative_flags(self.a)
-        # Add more opcodes as needed (this is a basic stub; full FCEUX-like implementation would have all 256 opcodes)
-        else:
-            # For demo, skip unknown
-            self.pc += 1
+        cycles = self.get_instruction_cycles(opcode)
+        self.cycles += cycles
+        # Simplified instruction execution - one table lookup per opcode
+        self._dispatch[opcode]()
+        return cycles
+
+    # Add more opcodes as needed (this is a basic stub; full FCEUX-like implementation would have all 256 opcodes)
+    def _lda_imm(self):  # LDA Immediate
+        pc = self.pc
+        self.a = a = self.memory.read(pc)
+        self.pc = pc + 1
+        self.flags = (self.flags & ~0x82) | ZN_FLAGS[a]
+
+    def _lda_abs(self):  # LDA Absolute
+        read = self.memory.read
+        pc = self.pc
+        addr = read(pc) | (read(pc + 1) << 8)
+        self.pc = pc + 2
+        self.a = a = read(addr)
+        self.flags = (self.flags & ~0x82) | ZN_FLAGS[a]
+
+    def _skip(self):
+        # For demo, skip unknown
+        self.pc += 1
 
     def get_instruction_cycles(self, opcode: int) -> int:
         # Simplified cycle counts
         return 2
 
     def set_zero_negative_flags(self, value: int):
-        self.flags &= ~0x82  # Clear Z and N
-        if value == 0:
-            self.flags |= 0x02  # Set Z
-        if value & 0x80:
-            self.flags |= 0x80  # Set N
+        # Clear Z and N, then set Z if value is zero and N from bit 7
+        self.flags = (self.flags & ~0x82) | ((value == 0) << 1) | (value & 0x80)
 
 class PPU:
     def __init__(self, memory: Memory):
@@ -124,10 +167,13 @@ class PPU:
         self.cycle = 0
         self.framebuffer = np.zeros((240, 256, 3), dtype=np.uint8)
         # Full NES palette (simplified to first few; full would have 64 colors)
-        self.palette = [
+        self.palette = np.array([
             (0x54, 0x54, 0x54), (0x00, 0x00, 0x00), (0x00, 0x00, 0x00),
             # ... (truncated for brevity; in full impl, load all 64)
-        ] * 16  # Repeat to simulate
+        ] * 16, dtype=np.uint8)  # Repeat to simulate
+        # Palette indices for the visible part of the current scanline;
+        # flushed into the framebuffer in one slice when the line ends
+        self._row_idx = bytearray(192)
 
     def step(self):
         self.cycle += 1
@@ -139,29 +185,52 @@ class PPU:
         
         if 0 <= self.scanline < 240 and self.cycle >= 65 and self.cycle < 257:
             # Render pixel - simplified (in full, fetch tiles, etc.)
-            x = self.cycle - 65
-            y = self.scanline
-            if 0 <= x < 256 and 0 <= y < 240:
-                self.framebuffer[y, x] = self.palette[0]  # Default blackish
+            self._row_idx[self.cycle - 65] = 0  # Default blackish
+            if self.cycle == 256:
+                row = np.frombuffer(self._row_idx, dtype=np.uint8)
+                self.framebuffer[self.scanline, :192] = self.palette[row]
+
+    def advance(self, dots: int):
+        # Same result as `dots` calls to step(), one scanline at a time
+        while dots:
+            n = min(dots, 341 - self.cycle)
+            end = self.cycle + n
+            if self.cycle < 256 <= end and self.scanline < 240:
+                row = np.frombuffer(self._row_idx, dtype=np.uint8)
+                self.framebuffer[self.scanline, :192] = self.palette[row]
+            if end >= 341:
+                self.cycle = 0
+                self.scanline = (self.scanline + 1) % 262
+            else:
+                self.cycle = end
+            dots -= n
 
     def get_framebuffer(self) -> np.ndarray:
-        return self.framebuffer.copy()
+        # Read-only view of the live buffer; callers that keep a frame copy it
+        fb = self.framebuffer.view()
+        fb.flags.writeable = False
+        return fb
 
 class Controller:
     def __init__(self):
         self.buttons = 0
         self.shift_register = 0
         self.strobe = 0
+        self.strobe_mask = 0  # -1 while strobe is high, else 0
 
     def read(self) -> int:
-        if self.strobe:
-            self.shift_register = self.buttons
-        return (self.shift_register & 1) | 0x40
+        # While strobed the register reloads from the buttons on every read
+        m = self.strobe_mask
+        sr = (self.shift_register & ~m) | (self.buttons & m)
+        self.shift_register = (sr >> 1) | 0x80  # 1s shift in after the 8 buttons
+        return (sr & 1) | 0x40
     
     def write(self, value: int):
         self.strobe = value & 1
-        if self.strobe:
-            self.shift_register = self.buttons
+        # Reload while strobe is high and on its falling edge (old or new mask set)
+        m = self.strobe_mask | -self.strobe
+        self.strobe_mask = -self.strobe
+        self.shift_register = (self.shift_register & ~m) | (self.buttons & m)
 
     def set_buttons(self, buttons: int):
         self.buttons = buttons
@@ -182,18 +251,20 @@ class Emulator:
         
         self.cpu.reset()
         self.running = True
+        self.frame_count = 0
 
     def run_frame(self):
         # Run until next NMI (simplified - run fixed cycles)
         cycles_per_frame = 29780  # Approximate NES cycles per frame
         cpu_cycles = 0
+        execute = self.cpu.execute_instruction
         
         while cpu_cycles < cycles_per_frame and self.running:
-            self.cpu.execute_instruction()
-            cpu_cycles += self.cpu.cycles
-            # PPU runs ~3 cycles per CPU cycle
-            for _ in range(3):
-                self.ppu.step()
+            cpu_cycles += execute()
+        # PPU runs 3 dots per CPU cycle; nothing here reads it back mid-frame,
+        # so it catches up in one call
+        self.ppu.advance(cpu_cycles * 3)
+        self.frame_count += 1
 
     def set_controller_input(self, player: int, buttons: int):
         if player == 1:
@@ -202,6 +273,9 @@ class Emulator:
     def get_frame(self) -> np.ndarray:
         return self.ppu.get_framebuffer()
 
+FRAME_SECONDS = 1 / 60  # emulation pacing on the worker thread
+MEMORY_VIEW_EVERY = 15  # ~4 Hz refresh of the RAM dump while running
+
 class NESEmulator:
     def __init__(self):
         self.root = tk.Tk()
@@ -213,6 +287,16 @@ class NESEmulator:
         self.fullscreen_state = False
         self.emulator = None
         self.rom_path = None
+        # Frames are emulated on a worker thread, scaled 2x into one of three
+        # recycled buffers and handed over through a one-slot queue; the Tk
+        # side only blits the newest one and returns the buffer via _free_q
+        self._frame_q = queue.Queue(maxsize=1)
+        self._free_q = queue.Queue()
+        for _ in range(3):  # one being blitted, one waiting, one being filled
+            self._free_q.put(np.empty((480, 512, 3), dtype=np.uint8))
+        self._worker = None
+        self._worker_stop = None
+        self._frames_shown = 0  # memory pane refreshes every MEMORY_VIEW_EVERY frames
         # Menu bar
         menubar = tk.Menu(self.root, bg='gray20', fg='white', tearoff=0)
         self.root.config(menu=menubar)
@@ -249,6 +333,9 @@ class NESEmulator:
         screen_frame.pack(expand=True, fill=tk.BOTH)
         self.screen = tk.Canvas(screen_frame, bg='black', width=512, height=480, highlightthickness=0)
         self.screen.pack(expand=True)
+        self.photo = ImageTk.PhotoImage('RGB', (512, 480))
+        self._scaled = np.empty((480, 512, 3), dtype=np.uint8)  # 2x frame, reused
+        self.screen.create_image(0, 0, anchor=tk.NW, image=self.photo)
         # Sidebar
         sidebar = tk.Frame(self.root, bg='gray20', width=300)
         sidebar.pack(side=tk.RIGHT, fill=tk.Y)
@@ -279,7 +366,10 @@ class NESEmulator:
         file = filedialog.askopenfilename(title="Load NES ROM", filetypes=[("NES ROMs", "*.nes")])
         if file:
             try:
+                self._stop_worker()
                 self.emulator = Emulator(file)
+                if self.running:
+                    self._start_worker()
                 self.rom_path = file
                 self.rom_var.set(os.path.basename(file))
                 messagebox.showinfo("ROM Loaded", f"Loaded ROM:\n{file}")
@@ -294,38 +384,85 @@ class NESEmulator:
         self.run_button.config(text="❚❚ Pause" if self.running else "▶ Run",
                                bg='red' if self.running else 'green')
         if self.running:
+            self._start_worker()
             self.emulation_step()
+        else:
+            self._stop_worker()
+    def _start_worker(self):
+        self._stop_worker()
+        self._worker_stop = threading.Event()
+        self._worker = threading.Thread(target=self._emulation_worker,
+                                        args=(self.emulator, self._worker_stop), daemon=True)
+        self._worker.start()
+    def _stop_worker(self):
+        if self._worker:
+            self._worker_stop.set()
+            self._worker.join()
+            self._worker = None
+        try:
+            self._free_q.put(self._frame_q.get_nowait())  # drop a frame the old worker left behind
+        except queue.Empty:
+            pass
+    def _emulation_worker(self, emulator, stop):
+        # Runs off the Tk thread: emulate at ~60 FPS, keep only the newest frame
+        deadline = time.perf_counter()
+        while not stop.is_set():
+            emulator.run_frame()
+            frame = emulator.get_frame()
+            buf = self._free_q.get()
+            # 2x nearest-neighbour straight from the PPU's buffer, no interim copy
+            buf.reshape(240, 2, 256, 2, 3)[:] = frame[:, None, :, None]
+            try:
+                self._free_q.put(self._frame_q.get_nowait())  # recycle the unshown frame
+            except queue.Empty:
+                pass
+            self._frame_q.put_nowait(buf)
+            deadline += FRAME_SECONDS
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                stop.wait(delay)
+            else:
+                deadline = time.perf_counter()  # fell behind; don't try to catch up
     def emulation_step(self):
         if not self.running or not self.emulator:
             return
-        # TODO: Replace this with CPU/PPU tick logic
-        self.emulator.run_frame()
-        self.update_screen()
-        self.update_status()
-        self.update_memory_view()
+        try:
+            scaled = self._frame_q.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            self.photo.paste(Image.frombuffer('RGB', (512, 480), scaled, 'raw', 'RGB', 0, 1))
+            self._free_q.put(scaled)
+            self.update_status()
+            self._frames_shown += 1
+            if self._frames_shown % MEMORY_VIEW_EVERY == 0:
+                self.update_memory_view()
         # Refresh at ~60 FPS
         self.root.after(16, self.emulation_step)
     def update_screen(self):
         if self.emulator:
             frame = self.emulator.get_frame()
-            img = Image.fromarray(frame, 'RGB')
-            img = img.resize((512, 480), Image.NEAREST)
-            photo = ImageTk.PhotoImage(img)
-            self.screen.delete("all")
-            self.screen.create_image(0, 0, anchor=tk.NW, image=photo)
-            self.screen.image = photo  # Keep a reference
+            # 2x nearest-neighbour by broadcasting into the reused buffer
+            self._scaled.reshape(240, 2, 256, 2, 3)[:] = frame[:, None, :, None]
+            self.photo.paste(Image.frombuffer('RGB', (512, 480), self._scaled, 'raw', 'RGB', 0, 1))
     def update_status(self):
         if self.emulator:
             cpu = self.emulator.cpu
-            self.status_label.config(text=f"PC={cpu.pc:04X} A={cpu.a:02X} X={cpu.x:02X} Y={cpu.y:02X} Flags={cpu.flags:02X}")
+            self.status_label.config(text=f"PC={cpu.pc:04X} A={cpu.a:02X} X={cpu.x:02X} Y={cpu.y:02X} Flags={cpu.flags:02X} "
+                                          f"Frame={self.emulator.frame_count}")
+    def show_toast(self, text: str, ms: int = 800):
+        # Transient notice over the screen; unlike a messagebox it never blocks the mainloop
+        toast = tk.Label(self.screen, text=text, bg='gray30', fg='white', padx=6, pady=2)
+        toast.place(relx=0.5, y=8, anchor=tk.N)
+        self.root.after(ms, toast.destroy)
     def update_memory_view(self):
         if self.emulator:
-            mem = self.emulator.memory.ram
+            # One hex pass over RAM; each 16-byte row is 48 chars incl. the separator
+            hx = self.emulator.memory.ram.tobytes().hex(' ').upper()
             self.mem_text.delete(1.0, tk.END)
-            for i in range(0, min(0x800, len(mem)), 16):
-                line = ' '.join(f"{mem[i+j]:02X}" for j in range(16) if i+j < len(mem))
-                self.mem_text.insert(tk.END, line + '\n')
+            self.mem_text.insert(tk.END, ''.join(hx[i:i + 47] + '\n' for i in range(0, len(hx), 48)))
     def reset(self):
+        self._stop_worker()
         if self.emulator:
             self.emulator.cpu.reset()
             self.update_screen()
@@ -333,17 +470,19 @@ class NESEmulator:
             self.update_memory_view()
         self.running = False
         self.run_button.config(text="▶ Run", bg='green')
-        messagebox.showinfo("Reset", "Emulator reset.")
+        self.show_toast("Emulator reset.")
     def frame_advance(self):
         if not self.emulator:
             messagebox.showwarning("No ROM", "Please load a ROM first.")
             return
-        # TODO: Execute one frame of emulation
+        # Frame advance pauses: the worker must not drive the emulator alongside us
+        self._stop_worker()
+        self.running = False
+        self.run_button.config(text="▶ Run", bg='green')
         self.emulator.run_frame()
         self.update_screen()
         self.update_status()
         self.update_memory_view()
-        messagebox.showinfo("Frame Advance", "Frame advanced.")
     def fullscreen(self):
         self.fullscreen_state = not self.fullscreen_state
         self.root.attributes('-fullscreen', self.fullscreen_state)
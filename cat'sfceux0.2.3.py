@@ -28,6 +28,10 @@ NES_PALETTE = np.array([
     [0,64,88],[0,0,0],[0,0,0],[0,0,0]
 ], dtype=np.uint8)
 
+# Pattern row (lo<<8)|hi -> its 8 two-bit pixels, leftmost first, as 8 bytes at row*8
+_BITS=np.unpackbits(np.arange(256,dtype=np.uint8)[:,None],axis=1)
+ROW_PIXELS=(_BITS[:,None,:]|(_BITS[None,:,:]<<1)).tobytes()
+
 # ──────────────────────────────
 # Enums
 # ──────────────────────────────
@@ -79,7 +83,7 @@ class CPU:
 # Mappers
 # ──────────────────────────────
 class Mapper0:
-    def __init__(self,cart): self.cart=cart
+    def __init__(self,cart): self.cart=cart; self.chr_bytes=cart.chr_rom
     def prg_read(self,addr): return self.cart.prg_rom[(addr-0x8000)%len(self.cart.prg_rom)]
     def prg_write(self,addr,val): pass
     def chr_read(self,addr): return self.cart.chr_rom[addr] if self.cart.chr_rom else 0
@@ -88,6 +92,7 @@ class Mapper0:
 class Mapper1:
     def __init__(self,cart):
         self.cart=cart; self.shift_reg=0; self.shift_count=0
+        self.chr_bytes=cart.chr_rom  # current CHR bank as raw bytes, read directly by PPU.render_frame
         self.prg_mode=0; self.prg_bank=0
     def prg_write(self,addr,val):
         pass
@@ -140,16 +145,18 @@ class PPU:
         self.memory=mem
         self.framebuffer=np.zeros((BASE_HEIGHT,BASE_WIDTH,3),np.uint8)
     def render_frame(self):
+        # Bind the nametable and the mapper's current CHR bytes once; the loops index them directly
+        vram=self.memory.vram; chr_bytes=self.memory.mapper.chr_bytes
+        pixels=bytearray(BASE_WIDTH*BASE_HEIGHT)  # palette index per pixel
         for y in range(30):
             for x in range(32):
-                tile=self.memory.read(0x2000+y*32+x)
+                tile_base=vram[y*32+x]*16
                 for py in range(8):
-                    for px in range(8):
-                        bit0=(self.memory.read(0x0000+tile*16+py)>>(7-px))&1
-                        bit1=(self.memory.read(0x0000+tile*16+py+8)>>(7-px))&1
-                        color=(bit1<<1)|bit0
-                        pal=NES_PALETTE[color%len(NES_PALETTE)]
-                        self.framebuffer[y*8+py,x*8+px]=pal
+                    row=((chr_bytes[tile_base+py]<<8)|chr_bytes[tile_base+py+8])*8
+                    out=(y*8+py)*BASE_WIDTH+x*8
+                    pixels[out:out+8]=ROW_PIXELS[row:row+8]
+        # Resolve every pixel to RGB with one gather from the (n, 3) uint8 palette
+        self.framebuffer[:]=NES_PALETTE[np.frombuffer(pixels,np.uint8).reshape(BASE_HEIGHT,BASE_WIDTH)]
         return self.framebuffer
     def get_framebuffer(self): return self.render_frame().copy()
 
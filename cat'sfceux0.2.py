@@ -5,13 +5,15 @@ import tkinter as tk
 from tkinter import Menu, messagebox, filedialog
 import struct
 import numpy as np
-from PIL import Image, ImageTk
 
 # ───────────────────────────────────────────────
 # Constants
 # ───────────────────────────────────────────────
 CPU_CYCLES_PER_FRAME = 29781
 
+# Binary PPM (P6) header for the 2x-scaled 512x480 RGB frame; Tk decodes it in C
+PPM_HEADER = b"P6\n512 480\n255\n"
+
 NES_PALETTE = np.array([
     [84, 84, 84], [0, 30, 116], [8, 16, 144], [48, 0, 136],
     [68, 0, 100], [92, 0, 48], [84, 4, 0], [60, 24, 0],
@@ -25,7 +27,7 @@ NES_PALETTE = np.array([
     [228, 84, 236], [236, 88, 180], [236, 106, 100], [212, 136, 32],
     [160, 170, 0], [116, 196, 0], [76, 208, 32], [56, 204, 108],
     [56, 180, 204], [60, 60, 60], [0, 0, 0], [0, 0, 0],
-])
+], dtype=np.uint8)
 
 # ───────────────────────────────────────────────
 # Core Stub Classes
@@ -50,13 +52,14 @@ class PPU:
     def __init__(self, nes):
         self.nes = nes
         self.framebuffer = np.zeros((240, 256, 3), dtype=np.uint8)
+        # Renderers write palette indices here; colours are resolved per frame
+        self._idx = np.zeros((240, 256), dtype=np.uint8)
+        # Simple test pattern if ROM is empty: diagonal 16x16 palette bands
+        self._idx[:] = (np.arange(240)[:, None] // 16 + np.arange(256) // 16) % len(NES_PALETTE)
 
     def render_frame(self):
-        # Simple test pattern if ROM is empty
-        for y in range(240):
-            for x in range(256):
-                color = NES_PALETTE[(x // 16 + y // 16) % len(NES_PALETTE)]
-                self.framebuffer[y, x] = color
+        # One gather from the palette turns the index buffer into RGB
+        np.take(NES_PALETTE, self._idx, axis=0, out=self.framebuffer)
         return self.framebuffer
 
 
@@ -119,7 +122,10 @@ class EmulatorGUI:
         self.menu.add_cascade(label="File", menu=file_menu)
         root.config(menu=self.menu)
 
-        self.image_ref = None
+        # one Tk image for the life of the window; frames are pasted into it
+        self.image_ref = tk.PhotoImage(width=512, height=480)
+        self._scaled = np.empty((480, 512, 3), dtype=np.uint8)  # 2x frame, reused
+        self.canvas.create_image(0, 0, anchor="nw", image=self.image_ref)
         self.root.after(16, self.update_frame)
 
     def load_rom(self):
@@ -132,9 +138,9 @@ class EmulatorGUI:
 
     def update_frame(self):
         frame = self.nes.step_frame()
-        img = Image.fromarray(frame, 'RGB').resize((512, 480))
-        self.image_ref = ImageTk.PhotoImage(img)
-        self.canvas.create_image(0, 0, anchor="nw", image=self.image_ref)
+        # 2x nearest-neighbour by broadcasting into the reused buffer
+        self._scaled.reshape(240, 2, 256, 2, 3)[:] = frame[:, None, :, None]
+        self.image_ref.configure(data=PPM_HEADER + self._scaled.tobytes(), format="PPM")
         self.root.after(16, self.update_frame)
 
 
@@ -4,9 +4,15 @@
 import tkinter as tk
 from tkinter import Menu, messagebox, filedialog, simpledialog
 import struct
+import queue
+import threading
+import time
 import numpy as np
 from typing import Optional
-from PIL import Image, ImageTk # Added for rendering the frame
+
+FRAME_SECONDS = 1 / 60  # emulation pacing on the worker thread
+# Binary PPM (P6) header for the 2x-scaled 512x480 RGB frame; Tk decodes it in C
+PPM_HEADER = b"P6\n512 480\n255\n"
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # NES Backend
@@ -17,18 +23,23 @@ class NESBackend:
         self.ppu = PPU(self)
         self.apu = APU()
         self.mapper = None
-        self.ram = bytearray(0x800)
-        self.vram = bytearray(0x1000)
-        self.rom_prg = bytearray()
-        self.rom_chr = bytearray()
+        # uint8 arrays over bytearrays: per-byte CPU/PPU accesses index the
+        # bytearrays (fast scalar access), rendering and DMA use the array side
+        self._ram = bytearray(0x800)
+        self._vram = bytearray(0x1000)
+        self.ram = np.frombuffer(self._ram, dtype=np.uint8)
+        self.vram = np.frombuffer(self._vram, dtype=np.uint8)
+        self.rom_prg = b''  # immutable: PRG is never written
+        self.rom_chr = b''  # bytes for CHR-ROM, a bytearray only for CHR-RAM
         self.cycles = 0
         self.frame_count = 0
         self.running = False
-        self.input_state = {'A': False, 'B': False, 'SELECT': False, 'START': False, 'UP': False, 'DOWN': False, 'LEFT': False, 'RIGHT': False}
-        self.key_map = {
-            'z': 'A', 'x': 'B',
-            'Return': 'START', 'Shift_R': 'SELECT',
-            'Up': 'UP', 'Down': 'DOWN', 'Left': 'LEFT', 'Right': 'RIGHT'
+        # Controller 1 as the NES sees it: one byte, bit 0 = A through bit 7 = Right
+        self.controller1 = 0
+        self.key_to_bit = {
+            'z': 0x01, 'x': 0x02,  # A, B
+            'Shift_R': 0x04, 'Return': 0x08,  # SELECT, START
+            'Up': 0x10, 'Down': 0x20, 'Left': 0x40, 'Right': 0x80
         }
 
 
@@ -43,11 +54,12 @@ class NESBackend:
                 chr_size = header[5] * 0x2000
                 mapper_id = (header[6] >> 4) | (header[7] & 0xF0)
                 prg_data = f.read(prg_size)
-                chr_data = f.read(chr_size) if chr_size else bytearray(0x2000)
+                chr_data = f.read(chr_size) if chr_size else bytearray(0x2000)  # CHR-RAM
 
-                self.mapper = Mapper(mapper_id, self)
                 self.rom_prg = prg_data
                 self.rom_chr = chr_data
+                self.mapper = Mapper(mapper_id, self)
+                self.cpu.specialize_bus()
                 self.cpu.reset()
                 self.ppu.load_chr(self.rom_chr)
                 self.running = True
@@ -63,32 +75,53 @@ class NESBackend:
             return self.ppu.framebuffer
             
         target_cycles = 29781  # Approx cycles per frame
-        self.cycles = 0
-        while self.cycles < target_cycles:
-            cycles = self.cpu.step()
-            self.ppu.step(cycles * 3)
-            self.apu.step()
-            self.cycles += cycles
+        cpu, ppu, apu = self.cpu, self.ppu, self.apu
+        # CPU cycles until the PPU next reaches scanline 241, from where it really is:
+        # CPU and PPU frames differ in length, so the PPU phase drifts frame to frame
+        vblank_dots = (((241 - ppu.scanline) % 262) or 262) * 341 - ppu.cycle
+        vblank_cycles = min((vblank_dots + 2) // 3, target_cycles)
+        # The whole frame in one loop: CPU dispatch runs inline with the dispatch
+        # table and bus read in locals, and the PPU is only touched at the two
+        # points the CPU can observe it. The CPU only sees the PPU through VBlank,
+        # so the first batch ends as VBlank starts and the second (the VBlank
+        # period) sees the flag set
+        opcodes = cpu.opcodes
+        read_byte = cpu.read_byte
+        start = cpu.cycles
+        done = 0
+        for boundary in (vblank_cycles, target_cycles):
+            batch_start = done
+            while done < boundary:
+                opcode = read_byte(cpu.pc)
+                cpu.pc += 1
+                done += opcodes[opcode]()
+            # An OAM DMA stall lands on cpu.cycles mid-batch; fold it into the count
+            done += cpu.cycles - (start + batch_start)
+            cpu.cycles = start + done
+            apu.step()
+            ppu.advance((done - batch_start) * 3)
+        self.cycles = done
         self.frame_count += 1
         return self.ppu.render_frame()
 
     def inject_cheat(self, addr: int, value: int):
         if 0 <= addr < len(self.ram):
-            self.ram[addr] = value
+            self._ram[addr] = value & 0xFF
             print(f"Cheat injected: RAM[0x{addr:04X}] = 0x{value:02X}")
 
     def debug_ram(self, addr: int) -> int:
-        return self.ram[addr % 0x800] if addr < 0x2000 else 0
+        return self._ram[addr % 0x800] if addr < 0x2000 else 0
         
     def set_key_state(self, key: str, pressed: bool):
-        if key in self.key_map:
-            button = self.key_map[key]
-            self.input_state[button] = pressed
-            # print(f"{button} {'Pressed' if pressed else 'Released'}") # For debugging input
+        bit = self.key_to_bit.get(key)
+        if bit:
+            self.controller1 = (self.controller1 | bit) if pressed else (self.controller1 & ~bit)
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # Mapper
 # ────────────────────────────────────────────────────────────────────────────────────
+_U16 = struct.Struct('<H').unpack_from  # little-endian word in one C call
+
 class Mapper:
     def __init__(self, id: int, nes: NESBackend):
         self.id = id
@@ -97,20 +130,31 @@ class Mapper:
         self.chr_banks = max(1, len(nes.rom_chr) // 0x2000)
         self.prg_bank0 = 0
         self.prg_bank1 = self.prg_banks - 1
+        self.map_prg()
         print(f"Mapper {id} initialized. PRG Banks: {self.prg_banks}")
 
+    def map_prg(self):
+        # Flatten the banked 0x8000-0xFFFF window once: prg_addr_map holds the PRG ROM
+        # offset of every CPU address, prg_window the bytes the CPU sees there.
+        # Call again whenever a bank register changes.
+        a = np.arange(0x8000, dtype=np.uint32)
+        bank = np.where(a < 0x4000, self.prg_bank0, self.prg_bank1).astype(np.uint32)
+        prg = self.nes.rom_prg
+        if self.id == 0 and prg:
+            self.prg_addr_map = (bank * 0x4000 + (a & 0x3FFF)) % len(prg)
+            self.prg_window = np.frombuffer(prg, dtype=np.uint8)[self.prg_addr_map].tobytes()
+        else:
+            # Only NROM is implemented; everything else reads as 0
+            self.prg_addr_map = np.zeros(0x8000, dtype=np.uint32)
+            self.prg_window = bytes(0x8000)
+
     def read_prg(self, addr: int) -> int:
-        if self.id == 0 and self.nes.rom_prg:
-            if 0x8000 <= addr <= 0xBFFF:
-                # First 16KB bank (or mirror of last if only 1 bank)
-                offset = self.prg_bank0 * 0x4000 + (addr - 0x8000)
-            elif 0xC000 <= addr <= 0xFFFF:
-                # Last 16KB bank
-                offset = self.prg_bank1 * 0x4000 + (addr - 0xC000)
-            else:
-                return 0
-            return self.nes.rom_prg[offset % len(self.nes.rom_prg)]
-        return 0
+        addr -= 0x8000
+        return self.prg_window[addr] if 0 <= addr < 0x8000 else 0
+
+    def read_prg_word(self, addr: int) -> int:
+        # Little-endian word at 0x8000-0xFFFE
+        return _U16(self.prg_window, addr - 0x8000)[0]
 
     def write_prg(self, addr: int, value: int): 
         # Mapper 0 (NROM) has no PRG writing, but other mappers would.
@@ -128,6 +172,61 @@ class Mapper:
 # ────────────────────────────────────────────────────────────────────────────────────
 # CPU (simplified example opcodes)
 # ────────────────────────────────────────────────────────────────────────────────────
+# Status register bits
+FLAG_C = 0x01
+FLAG_Z = 0x02
+FLAG_I = 0x04
+FLAG_D = 0x08
+FLAG_B = 0x10
+FLAG_U = 0x20
+FLAG_V = 0x40
+FLAG_N = 0x80
+
+def _set_zn(reg: str) -> str:
+    # Z and N from `reg` in one store, masks inlined as literals
+    return (f"self.flags = (self.flags & 0x{0xFF & ~(FLAG_Z | FLAG_N):02X}) "
+            f"| (0x{FLAG_Z:02X} if {reg} == 0 else 0) | ({reg} & 0x{FLAG_N:02X})")
+
+# Handler bodies for the implemented opcodes, specialized into plain methods at
+# import with every flag mask written as an integer literal
+_HANDLER_BODIES = {
+    'lda_imm': ['pc = self.pc', 'v = self.read_byte(pc)', 'self.pc = pc + 1', 'self.a = v',
+                _set_zn('v'), 'return 2'],
+    'lda_abs': ['addr = self.read_word_pc()', 'self.pc += 2', 'v = self.read_byte(addr)', 'self.a = v',
+                _set_zn('v'), 'return 4'],
+    'sta_abs': ['addr = self.read_word_pc()', 'self.pc += 2', 'self.write_byte(addr, self.a)', 'return 4'],
+    'jmp_abs': ['self.pc = self.read_word_pc()', 'return 3'],
+}
+
+def _build_handlers() -> dict:
+    ns = {}
+    src = '\n\n'.join('\n'.join([f'def {name}(self) -> int:'] + ['    ' + ln for ln in body])
+                       for name, body in _HANDLER_BODIES.items())
+    exec(compile(src, '<cpu handlers>', 'exec'), ns)
+    return {name: ns[name] for name in _HANDLER_BODIES}
+
+_HANDLERS = _build_handlers()
+
+def _build_read_byte(nes: NESBackend):
+    # NROM never banks its PRG, so the bus read can be generated once per ROM with
+    # the address decode resolved and the PRG mirror mask written as a literal
+    size = len(nes.rom_prg)
+    if nes.mapper is None or nes.mapper.id != 0 or size not in (0x4000, 0x8000):
+        return None
+    src = '\n'.join([
+        'def read_byte(addr):',
+        '    if addr >= 0x8000:',
+        f'        return prg[addr & 0x{size - 1:04X}] if addr <= 0xFFFF else 0',
+        '    if addr < 0x2000:',
+        '        return ram[addr & 0x7FF]',
+        '    if addr < 0x4000:',
+        '        return read_reg(addr & 7)',
+        '    return 0  # controller and everything else are stubbed',
+    ])
+    ns = {'prg': nes.rom_prg, 'ram': nes._ram, 'read_reg': nes.ppu.read_reg}
+    exec(compile(src, '<read_byte>', 'exec'), ns)
+    return ns['read_byte']
+
 class CPU:
     def __init__(self, nes: NESBackend):
         self.nes = nes
@@ -138,16 +237,15 @@ class CPU:
         self.y = 0
         self.flags = 0x24
         self.cycles = 0
-        self.flag_mask = {'C':1,'Z':2,'I':4,'D':8,'B':16,'U':32,'V':64,'N':128}
-        # Very minimal opcode set for demonstration
-        self.opcodes = {
-            0x00: self.brk,
-            0xA9: self.lda_imm,
-            0xAD: self.lda_abs,
-            0x8D: self.sta_abs,
-            0x4C: self.jmp_abs,
-            # Add more opcodes here as needed
-        }
+        # Very minimal opcode set for demonstration; a 256-entry list indexed
+        # by opcode, with unimplemented opcodes falling through to nop
+        self.opcodes = [self.nop] * 256
+        self.opcodes[0x00] = self.brk
+        self.opcodes[0xA9] = self.lda_imm
+        self.opcodes[0xAD] = self.lda_abs
+        self.opcodes[0x8D] = self.sta_abs
+        self.opcodes[0x4C] = self.jmp_abs
+        # Add more opcodes here as needed
 
     def reset(self):
         # For NROM, typically start at 0xC000
@@ -162,11 +260,20 @@ class CPU:
     def step(self) -> int:
         opcode = self.read_byte(self.pc)
         self.pc += 1
-        return self.opcodes.get(opcode, self.nop)()
+        return self.opcodes[opcode]()
+
+    def specialize_bus(self):
+        # Use a read_byte generated for the loaded ROM when the mapper allows it,
+        # otherwise the generic one below
+        read_byte = _build_read_byte(self.nes)
+        if read_byte:
+            self.read_byte = read_byte
+        else:
+            self.__dict__.pop('read_byte', None)
 
     def read_byte(self, addr: int) -> int:
         if addr < 0x2000:
-            return self.nes.ram[addr % 0x800]
+            return self.nes._ram[addr % 0x800]
         elif 0x2000 <= addr <= 0x3FFF:
             return self.nes.ppu.read_reg(addr % 8)
         elif 0x4016 == addr: # Controller 1
@@ -180,9 +287,17 @@ class CPU:
         hi = self.read_byte(addr + 1)
         return (hi << 8) | lo
 
+    def read_word_pc(self) -> int:
+        # Operand fetch: PC is nearly always in PRG ROM, so read both bytes through
+        # the mapper at once instead of decoding each address in read_byte
+        pc = self.pc
+        if 0x8000 <= pc < 0xFFFF:
+            return self.nes.mapper.read_prg_word(pc)
+        return self.read_word(pc)
+
     def write_byte(self, addr: int, value: int):
         if addr < 0x2000:
-            self.nes.ram[addr % 0x800] = value
+            self.nes._ram[addr % 0x800] = value & 0xFF
         elif 0x2000 <= addr <= 0x3FFF:
             self.nes.ppu.write_reg(addr % 8, value)
         elif 0x4014 == addr: # OAM DMA
@@ -192,54 +307,50 @@ class CPU:
         elif addr >= 0x8000:
             self.nes.mapper.write_prg(addr, value)
 
-    def set_flags(self, f, v):
-        if v:
-            self.flags |= self.flag_mask[f]
-        else:
-            self.flags &= ~self.flag_mask[f]
-
-    def get_flag(self, f) -> bool:
-        return (self.flags & self.flag_mask[f]) > 0
-        
     # --- Example Opcodes ---
 
-    def lda_imm(self) -> int:
-        self.a = self.read_byte(self.pc)
-        self.pc += 1
-        self.set_flags('Z', self.a == 0)
-        self.set_flags('N', self.a & 0x80)
-        return 2
-
-    def lda_abs(self) -> int:
-        addr = self.read_word(self.pc)
-        self.pc += 2
-        self.a = self.read_byte(addr)
-        self.set_flags('Z', self.a == 0)
-        self.set_flags('N', self.a & 0x80)
-        return 4
-
-    def sta_abs(self) -> int:
-        addr = self.read_word(self.pc)
-        self.pc += 2
-        self.write_byte(addr, self.a)
-        return 4
-        
-    def jmp_abs(self) -> int:
-        self.pc = self.read_word(self.pc)
-        return 3
+    lda_imm = _HANDLERS['lda_imm']
+    lda_abs = _HANDLERS['lda_abs']
+    sta_abs = _HANDLERS['sta_abs']
+    jmp_abs = _HANDLERS['jmp_abs']
 
     def brk(self) -> int: return 7
     def nop(self) -> int: return 2
 
 # ────────────────────────────────────────────────────────────────────────────────────
-# PPU (stub render)
+# PPU (background render)
 # ────────────────────────────────────────────────────────────────────────────────────
 class PPU:
+    # NES master palette (64 colors), approximate sRGB
+    PALETTE_RGB = np.array([
+        [84,  84,  84],[  0,  30, 116],[  8,  16, 144],[ 48,   0, 136],
+        [68,   0, 100],[92,   0,  48],[84,   4,   0],[60,  24,   0],
+        [32,  42,   0],[  8,  58,   0],[  0,  64,   0],[  0,  60,  0],
+        [  0,  50, 60],[  0,   0,   0],[  0,   0,   0],[  0,   0,   0],
+        [152, 150, 152],[  8,  76, 196],[ 48,  50, 236],[ 92,  30, 228],
+        [136,  20, 176],[160,  20, 100],[152,  34,  32],[120,  60,   0],
+        [ 84,  90,   0],[ 40, 114,   0],[  8, 124,   0],[  0, 118,  40],
+        [  0, 102, 120],[  0,   0,   0],[  0,   0,   0],[  0,   0,   0],
+        [236, 238, 236],[ 76, 154, 236],[120, 124, 236],[176,  98, 236],
+        [228,  84, 236],[236,  88, 180],[236, 106, 100],[212, 136,  32],
+        [160, 170,   0],[116, 196,   0],[ 76, 208,  32],[ 56, 204, 108],
+        [ 56, 180, 204],[ 60,  60,  60],[  0,   0,   0],[  0,   0,   0],
+        [236, 238, 236],[168, 204, 236],[188, 188, 236],[212, 178, 236],
+        [236, 174, 236],[236, 174, 212],[236, 180, 176],[228, 196, 144],
+        [204, 210, 120],[180, 222, 120],[168, 226, 144],[152, 226, 180],
+        [160, 214, 228],[160, 162, 160],[  0,   0,   0],[  0,   0,   0],
+    ], dtype=np.uint8)
+    # Per tile of the 30x32 nametable: offset of its attribute byte, and the shift of
+    # its 2-bit palette select within that byte (quadrant: 0, 2, 4 or 6)
+    ATTR_INDEX = 0x3C0 + (np.arange(30)[:, None] // 4) * 8 + np.arange(32) // 4
+    ATTR_SHIFT = ((np.arange(32) & 2) | ((np.arange(30)[:, None] & 2) << 1)).astype(np.uint8)
+
     def __init__(self, nes: NESBackend):
         self.nes = nes
         self.chr = bytearray(0x2000)
+        self.chr_decoded = np.zeros((512, 8, 8), dtype=np.uint8)
         self.palette = bytearray(0x20)
-        self.oam = bytearray(0x100)
+        self.oam = np.zeros(0x100, dtype=np.uint8)
         self.framebuffer = np.zeros((240, 256, 3), dtype=np.uint8)
         self.scanline = 0
         self.cycle = 0
@@ -258,41 +369,65 @@ class PPU:
 
     def load_chr(self, chr_data: bytes):
         self.chr = bytearray(chr_data)
+        # Decode the 16-byte planar tiles once into (n, 8, 8) 2-bit pixels, [tile, row, column]
+        planes = np.frombuffer(self.chr, dtype=np.uint8).reshape(-1, 16)
+        low = np.unpackbits(planes[:, :8, None], axis=-1, bitorder='big')
+        high = np.unpackbits(planes[:, 8:, None], axis=-1, bitorder='big')
+        self.chr_decoded = low | (high << 1)
 
     def step(self, cycles: int):
-        # Simplified step: Just check for VBlank
+        # Simplified step: advance any number of PPU cycles a scanline at a time,
+        # setting VBlank on scanline 241 and clearing it on the pre-render line (261)
         self.cycle += cycles
-        if self.scanline < 240: # Visible scanlines
-            if self.cycle >= 341:
-                self.cycle -= 341
-                self.scanline += 1
-        elif self.scanline == 241: # VBlank start
-            if self.cycle >= 1: # Start VBlank on 241st scanline, 1st cycle
+        while self.cycle >= 341:
+            self.cycle -= 341
+            self.scanline += 1
+            if self.scanline == 241: # VBlank start
                 self.ppustatus |= 0x80 # Set VBlank flag
                 if self.ppuctrl & 0x80:
                     # Trigger NMI
                     pass # self.nes.cpu.nmi()
-        elif self.scanline < 261: # VBlank scanlines
-             if self.cycle >= 341:
-                self.cycle -= 341
-                self.scanline += 1
-        elif self.scanline == 261: # Pre-render scanline
-            if self.cycle >= 1:
+            elif self.scanline == 261: # Pre-render scanline
                 self.ppustatus &= ~0x80 # Clear VBlank flag
-            if self.cycle >= 341:
-                self.cycle -= 341
+            elif self.scanline > 261:
                 self.scanline = 0 # Wrap to first scanline
-                
+
+    def advance(self, dots: int):
+        # Same result as step(dots) without walking the scanlines: only the last
+        # VBlank edge crossed matters, and that is decided by the line we land on
+        crossed, self.cycle = divmod(self.cycle + dots, 341)
+        if not crossed:
+            return
+        old = self.scanline
+        line = self.scanline = (old + crossed) % 262
+        if crossed > (240 - old) % 262 or crossed > (260 - old) % 262:
+            if 241 <= line < 261:
+                self.ppustatus |= 0x80 # VBlank (NMI would be raised here if enabled)
+            else:
+                self.ppustatus &= ~0x80
 
     def render_frame(self) -> np.ndarray:
-        # Stub: just return a black (or gray) buffer
-        # A real render would draw tiles here based on PPU state
-        if self.nes.running:
-             # Fill with a color to show it's "running"
-             self.framebuffer[:, :] = [48, 48, 48] 
-        else:
-             # Fill with black when off
-             self.framebuffer[:, :] = [0, 0, 0]
+        # Background only, whole screen at once: build a (240, 256) plane of palette
+        # RAM values with NumPy, then resolve it to RGB with one gather
+        if not self.nes.running:
+            # Fill with black when off
+            self.framebuffer[:, :] = [0, 0, 0]
+            return self.framebuffer
+        palette = np.frombuffer(self.palette, dtype=np.uint8) & 0x3F
+        if not self.ppumask & 0x08:
+            # Background disabled: the whole screen shows the backdrop color
+            self.framebuffer[:, :] = self.PALETTE_RGB[palette[0]]
+            return self.framebuffer
+        base = (self.ppuctrl & 0x03) * 0x400  # nametable selected by PPUCTRL
+        nametable = self.nes.vram[base:base + 0x400]
+        tiles = nametable[:0x3C0].reshape(30, 32).astype(np.intp)
+        if self.ppuctrl & 0x10:
+            tiles += 256  # background pattern table at $1000
+        pix = self.chr_decoded[tiles].transpose(0, 2, 1, 3).reshape(240, 256)
+        sel = ((nametable[self.ATTR_INDEX] >> self.ATTR_SHIFT) & 0x03).repeat(8, axis=0).repeat(8, axis=1)
+        # Pixel value 0 is the universal background color
+        index = palette[np.where(pix, (sel << 2) | pix, 0)]
+        np.take(self.PALETTE_RGB, index, axis=0, out=self.framebuffer)
         return self.framebuffer
 
     def read_reg(self, addr: int) -> int:
@@ -349,7 +484,7 @@ class PPU:
         if addr < 0x2000:
             return self.nes.mapper.read_chr(addr)
         elif addr < 0x3F00:
-            return self.nes.vram[addr % 0x1000] # Nametables
+            return self.nes._vram[addr % 0x1000] # Nametables
         elif addr < 0x4000:
             addr = (addr & 0x1F)
             if addr in (0x10, 0x14, 0x18, 0x1C): addr -= 0x10 # Palette mirrors
@@ -361,20 +496,25 @@ class PPU:
         if addr < 0x2000:
             self.nes.mapper.write_chr(addr, val)
         elif addr < 0x3F00:
-            self.nes.vram[addr % 0x1000] = val
+            self.nes._vram[addr % 0x1000] = val
         elif addr < 0x4000:
             addr = (addr & 0x1F)
             if addr in (0x10, 0x14, 0x18, 0x1C): addr -= 0x10 # Palette mirrors
             self.palette[addr] = val
             
     def do_oam_dma(self, page: int):
-        # CPU transfers 256 bytes from RAM page `page` to OAM
+        # CPU transfers 256 bytes from page `page` to OAM, starting at OAMADDR and wrapping
         addr_start = page << 8
-        for i in range(256):
-            val = self.nes.cpu.read_byte(addr_start + i)
-            self.oam[(self.oamaddr + i) & 0xFF] = val
-        # This should also stall the CPU for 513/514 cycles
-        # self.nes.cpu.cycles += 513 
+        if addr_start < 0x2000:
+            src = self.nes.ram[addr_start & 0x7FF:(addr_start & 0x7FF) + 256]
+        else:
+            read_byte = self.nes.cpu.read_byte
+            src = np.fromiter((read_byte(addr_start + i) for i in range(256)), dtype=np.uint8, count=256)
+        k = self.oamaddr
+        self.oam[k:] = src[:256 - k]
+        self.oam[:k] = src[256 - k:]
+        # The transfer stalls the CPU for 513 cycles
+        self.nes.cpu.cycles += 513
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # APU (stub)
@@ -407,16 +547,29 @@ class GUI(tk.Tk):
         self.canvas = tk.Canvas(self, width=512, height=480, bg="black", highlightthickness=0)
         self.canvas.pack()
         
-        # Prepare the image object for the framebuffer
-        self.image = Image.new('RGB', (256, 240))
-        self.photo_image = ImageTk.PhotoImage(self.image.resize((512, 480), Image.NEAREST))
+        # One Tk image for the life of the window; update_game upscales into the
+        # reused buffer and loads it as PPM
+        self.upscaled = np.zeros((480, 512, 3), dtype=np.uint8)
+        self.photo_image = tk.PhotoImage(width=512, height=480)
         self.image_on_canvas = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo_image)
+
+        # Three frame buffers circulate between the worker and update_game: the
+        # worker fills one from _free_q and hands it over through the one-slot
+        # _frame_q; update_game returns it to _free_q once it has been drawn
+        self._frame_q = queue.Queue(maxsize=1)
+        self._free_q = queue.Queue()
+        for _ in range(3):
+            self._free_q.put(np.zeros((240, 256, 3), dtype=np.uint8))
+        self._worker = None
+        self._worker_stop = None
         
         # Bind keyboard input
         self.bind("<KeyPress>", self.on_key_press)
         self.bind("<KeyRelease>", self.on_key_release)
         
         print("GUI Initialized. Starting game loop.")
+        self._start_worker()
+        self.next_deadline = time.perf_counter()
         self.update_game()
 
     def create_menu(self):
@@ -453,7 +606,9 @@ class GUI(tk.Tk):
         )
         if path:
             print(f"Loading ROM from: {path}")
+            self._stop_worker()
             self.nes.load_rom(path)
+            self._start_worker()
 
     def open_cheats(self):
         cheat_code = simpledialog.askstring("Inject Cheat", "Enter cheat (e.g., 0400:FF):")
@@ -487,16 +642,59 @@ class GUI(tk.Tk):
         self.nes.set_key_state(event.keysym, False)
 
     def update_game(self):
-        # Run one frame of the emulator
-        frame = self.nes.step_frame()
-        
-        # Update the image on the canvas
-        self.image = Image.fromarray(frame, 'RGB')
-        self.photo_image = ImageTk.PhotoImage(self.image.resize((512, 480), Image.NEAREST))
-        self.canvas.itemconfig(self.image_on_canvas, image=self.photo_image)
+        # Show the newest frame the worker finished, if there is one we haven't drawn
+        try:
+            frame = self._frame_q.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            # 2x nearest-neighbour upscale by broadcasting into the persistent buffer
+            self.upscaled.reshape(240, 2, 256, 2, 3)[...] = frame[:, None, :, None]
+            self._free_q.put(frame)
+            self.photo_image.configure(data=PPM_HEADER + self.upscaled.tobytes(), format="PPM")
         
-        # Schedule the next update (aims for ~60 FPS)
-        self.after(16, self.update_game)
+        # Schedule the next update against a fixed 60 FPS deadline, so the time
+        # spent drawing doesn't stretch the frame period
+        self.next_deadline += FRAME_SECONDS
+        now = time.perf_counter()
+        if self.next_deadline < now:
+            self.next_deadline = now  # fell behind; don't try to catch up
+        self.after(max(1, int((self.next_deadline - now) * 1000)), self.update_game)
+
+    def _start_worker(self):
+        self._stop_worker()
+        self._worker_stop = threading.Event()
+        self._worker = threading.Thread(target=self._emu_loop,
+                                        args=(self._worker_stop,), daemon=True)
+        self._worker.start()
+
+    def _stop_worker(self):
+        if self._worker:
+            self._worker_stop.set()
+            self._worker.join()
+            self._worker = None
+        try:
+            self._free_q.put(self._frame_q.get_nowait())  # drop a frame the old worker left behind
+        except queue.Empty:
+            pass
+
+    def _emu_loop(self, stop):
+        # Runs off the Tk thread: emulate at ~60 FPS, keep only the newest frame
+        deadline = time.perf_counter()
+        while not stop.is_set():
+            buf = self._free_q.get()
+            np.copyto(buf, self.nes.step_frame())
+            try:
+                self._free_q.put(self._frame_q.get_nowait())  # recycle the unshown frame
+            except queue.Empty:
+                pass
+            self._frame_q.put_nowait(buf)
+            deadline += FRAME_SECONDS
+            delay = deadline - time.perf_counter()
+            if delay > 0:
+                stop.wait(delay)
+            else:
+                deadline = time.perf_counter()  # fell behind; don't try to catch up
 
 # ────────────────────────────────────────────────────────────────────────────────────
 # Main Execution
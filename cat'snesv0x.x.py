@@ -50,17 +50,19 @@ class Cartridge:
         prg_size = prg_banks * 0x4000
         chr_size = chr_banks * 0x2000
         offset = 16 + (512 if flag6 & 0x04 else 0)
-        self.prg_rom = rom_data[offset:offset + prg_size]
-        self.chr_rom = rom_data[offset + prg_size:offset + prg_size + chr_size]
+        # uint8 views into the file image, no copies
+        rom = np.frombuffer(rom_data, dtype=np.uint8)
+        self.prg_rom = rom[offset:offset + prg_size]
+        self.chr_rom = rom[offset + prg_size:offset + prg_size + chr_size]
         self.prg_banks = prg_banks
         self.chr_banks = chr_banks
 
 class Memory:
     def __init__(self, cartridge: Optional[Cartridge] = None):
-        self.ram = [0] * 0x800
-        self.vram = [0] * 0x1000
-        self.palette_ram = [0] * 0x20
-        self.oam = [0] * 0x100
+        self.ram = np.zeros(0x800, dtype=np.uint8)
+        self.vram = np.zeros(0x1000, dtype=np.uint8)
+        self.palette_ram = np.zeros(0x20, dtype=np.uint8)
+        self.oam = np.zeros(0x100, dtype=np.uint8)
         self.cartridge = cartridge
         self.mapper = Mapper(cartridge) if cartridge else None
         self.controller = None